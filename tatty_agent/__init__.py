@@ -79,6 +79,7 @@ After installation, you have access to:
 """
 
 import asyncio
+from collections.abc import Callable, Coroutine
 from pathlib import Path
 from typing import Optional, Union, Dict, Any, List
 
@@ -173,6 +174,10 @@ class TattyAgent:
         # Initialize runtime
         self.runtime = AgentRuntime(self.state, self.callbacks)
 
+        # Drives the agent coroutine to completion; replace it (e.g. in tests)
+        # instead of patching asyncio.run globally
+        self._runner: Callable[[Coroutine[Any, Any, str]], str] = asyncio.run
+
         # Conversation history
         self._conversation_history: List[Dict[str, Any]] = []
 
@@ -220,7 +225,7 @@ class TattyAgent:
 
         try:
             # Run the agent loop (nest_asyncio applied at import time if needed)
-            result = asyncio.run(self.runtime.run_loop(query, iterations))
+            result = self._runner(self.runtime.run_loop(query, iterations))
 
             # Add result to conversation history
             self._conversation_history.append({
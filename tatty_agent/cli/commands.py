@@ -9,13 +9,62 @@ This module contains commands like:
 import argparse
 import sys
 import os
+from functools import cache
 from pathlib import Path
 
 from ..config import ProjectInitializer, load_config
+from .utils import resolve_directory
 
+_STATUS_ICONS = {True: "✅", False: "❌"}
 
-def tatty_init():
-    """Initialize a project with TATty Agent artifact folders and BAML setup"""
+
+def _print_status(project_dir: Path) -> None:
+    """Print the initialization status of a project directory"""
+    initializer = ProjectInitializer(str(project_dir))
+
+    print(f"📁 Checking status for: {project_dir}")
+    print()
+
+    status = initializer.check_project_status()
+
+    if status["initialized"]:
+        print("✅ Project is properly initialized with TATty Agent")
+    else:
+        print("⚠️  Project is not fully initialized")
+
+    print("\n📂 Artifact Folders:")
+    for folder, info in status["folders"].items():
+        exists = info["exists"]
+        if exists:
+            print(f"  ✅ {folder}/ ({info['file_count']} files)")
+        else:
+            print(f"  ❌ {folder}/ ")
+            print(f"      {info['description']}")
+
+    print("\n📄 Configuration Files:")
+    for file, info in status["files"].items():
+        exists = info["exists"]
+        print(f"  {_STATUS_ICONS[exists]} {file}")
+        if not exists:
+            print(f"      {info['description']}")
+
+    # dict.fromkeys drops duplicates while keeping the reported order
+    missing = list(dict.fromkeys(status["missing"]))
+    if missing:
+        print(f"\n⚠️  Missing items: {len(missing)}")
+        for item in missing:
+            print(f"  - {item}")
+
+    recommendations = dict.fromkeys(status["recommendations"])
+    if recommendations:
+        print("\n💡 Recommendations:")
+        for rec in recommendations:
+            print(f"  - {rec}")
+
+
+@cache
+def _init_parser():
+    """Build the tatty-init argument parser (cached across calls)"""
     parser = argparse.ArgumentParser(
         prog="tatty-init",
         description="Initialize a project with TATty Agent artifact folders and configuration"
@@ -36,61 +85,24 @@ def tatty_init():
         action="store_true",
         help="Check initialization status without making changes"
     )
+    return parser
 
-    args = parser.parse_args()
 
-    # Resolve the target directory
-    project_dir = Path(args.dir).resolve()
-    if not project_dir.exists():
-        print(f"❌ Error: Directory does not exist: {project_dir}")
-        sys.exit(1)
-
-    if not project_dir.is_dir():
-        print(f"❌ Error: Not a directory: {project_dir}")
-        sys.exit(1)
+def tatty_init():
+    """Initialize a project with TATty Agent artifact folders and BAML setup"""
+    args = _init_parser().parse_args()
 
-    # Initialize the project initializer
-    initializer = ProjectInitializer(project_dir)
+    # Resolve the target directory
+    project_dir = Path(resolve_directory(args.dir))
 
     # Check status if requested
     if args.status:
-        print(f"📁 Checking status for: {project_dir}")
-        print()
-
-        status = initializer.check_project_status()
-
-        if status["initialized"]:
-            print("✅ Project is properly initialized with TATty Agent")
-        else:
-            print("⚠️  Project is not fully initialized")
-
-        print("\n📂 Artifact Folders:")
-        for folder, info in status["folders"].items():
-            status_icon = "✅" if info["exists"] else "❌"
-            file_count = f"({info['file_count']} files)" if info["exists"] else ""
-            print(f"  {status_icon} {folder}/ {file_count}")
-            if not info["exists"]:
-                print(f"      {info['description']}")
-
-        print("\n📄 Configuration Files:")
-        for file, info in status["files"].items():
-            status_icon = "✅" if info["exists"] else "❌"
-            print(f"  {status_icon} {file}")
-            if not info["exists"]:
-                print(f"      {info['description']}")
-
-        if status["missing"]:
-            print(f"\n⚠️  Missing items: {len(status['missing'])}")
-            for item in status["missing"]:
-                print(f"  - {item}")
-
-        if status["recommendations"]:
-            print("\n💡 Recommendations:")
-            for rec in status["recommendations"]:
-                print(f"  - {rec}")
-
+        _print_status(project_dir)
         return
 
+    # Initialize the project initializer
+    initializer = ProjectInitializer(str(project_dir))
+
     # Perform initialization
     print(f"🚀 Initializing TATty Agent project in: {project_dir}")
     print()
@@ -136,8 +148,9 @@ def tatty_init():
         sys.exit(1)
 
 
-def tatty_tui():
-    """Launch TUI mode directly"""
+@cache
+def _tui_parser():
+    """Build the tatty-tui argument parser (cached across calls)"""
     parser = argparse.ArgumentParser(
         prog="tatty-tui",
         description="Launch TATty Agent TUI (Terminal User Interface)"
@@ -153,8 +166,12 @@ def tatty_tui():
         nargs="?",
         help="Initial query to start with"
     )
+    return parser
+
 
-    args = parser.parse_args()
+def tatty_tui():
+    """Launch TUI mode directly"""
+    args = _tui_parser().parse_args()
 
     # Load configuration
     config = load_config(working_dir=args.dir)
@@ -164,7 +181,7 @@ def tatty_tui():
     try:
         # Import and launch TUI
         from ..tui.app import run_tui
-        run_tui(working_dir=config.working_dir, initial_query=args.query)
+        run_tui(working_dir=config.resolved_working_dir, initial_query=args.query)
     except ImportError as e:
         print(f"❌ Error: Could not import TUI module: {e}")
         print("TUI will be available in Phase 4")
@@ -177,8 +194,9 @@ def tatty_tui():
         sys.exit(1)
 
 
-def tatty_status():
-    """Check project initialization status"""
+@cache
+def _status_parser():
+    """Build the tatty-status argument parser (cached across calls)"""
     parser = argparse.ArgumentParser(
         prog="tatty-status",
         description="Check TATty Agent project status"
@@ -189,12 +207,17 @@ def tatty_status():
         default=".",
         help="Directory to check (default: current directory)"
     )
+    return parser
+
 
-    args = parser.parse_args()
+def tatty_status():
+    """Check project initialization status"""
+    args = _status_parser().parse_args()
 
-    # This is essentially the same as tatty-init --status
-    sys.argv = ["tatty-init", "--status", "--dir", args.dir]
-    tatty_init()
+    project_dir = Path(resolve_directory(args.dir))
+
+    # Same output as tatty-init --status, without re-parsing arguments
+    _print_status(project_dir)
 
 
 def main():
@@ -212,17 +235,20 @@ def main():
     # Remove the command from argv so subcommands can parse their own args
     sys.argv = [sys.argv[0]] + sys.argv[2:]
 
-    if command == "init":
-        tatty_init()
-    elif command == "tui":
-        tatty_tui()
-    elif command == "status":
-        tatty_status()
-    else:
+    commands = {
+        "init": tatty_init,
+        "tui": tatty_tui,
+        "status": tatty_status,
+    }
+
+    handler = commands.get(command)
+    if handler is None:
         print(f"❌ Unknown command: {command}")
         print("Available commands: init, tui, status")
         sys.exit(1)
 
+    handler()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
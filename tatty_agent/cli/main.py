@@ -9,11 +9,22 @@ import argparse
 import asyncio
 import os
 import sys
-from pathlib import Path
-from dotenv import load_dotenv
+from functools import cache
 
 from ..core.runtime import AgentRuntime
 from ..core.state import AgentState, AgentCallbacks
+from .utils import resolve_directory
+
+# Indent strings for nested agent depths, built once instead of per callback
+_INDENTS = tuple("  " * i for i in range(32))
+
+# Characters of a tool result shown in verbose mode
+_RESULT_PREVIEW_CHARS = 200
+
+
+def _indent(depth: int) -> str:
+    """Get the indent string for a sub-agent depth"""
+    return _INDENTS[depth] if depth < len(_INDENTS) else "  " * depth
 
 
 class CLICallbacks(AgentCallbacks):
@@ -26,12 +37,12 @@ class CLICallbacks(AgentCallbacks):
     async def on_iteration(self, iteration: int, depth: int):
         """Handle iteration updates"""
         if self.verbose:
-            indent = "  " * depth
+            indent = _indent(depth)
             print(f"{indent}🔄 Iteration {iteration} (depth {depth})")
 
     async def on_tool_start(self, tool_name: str, params: dict, tool_idx: int, total_tools: int, depth: int):
         """Handle tool execution start"""
-        indent = "  " * depth
+        indent = _indent(depth)
         print(f"{indent}🛠️  Executing {tool_name}...")
         if self.verbose and params:
             for key, value in params.items():
@@ -40,12 +51,12 @@ class CLICallbacks(AgentCallbacks):
 
     async def on_tool_result(self, result: str, depth: int):
         """Handle tool execution result"""
-        indent = "  " * depth
+        indent = _indent(depth)
         print(f"{indent}✅ Tool completed")
         if self.verbose and result:
             # Truncate long results in verbose mode
-            display_result = result[:200] + "..." if len(result) > 200 else result
-            print(f"{indent}📄 Result: {display_result}")
+            suffix = "..." if len(result) > _RESULT_PREVIEW_CHARS else ""
+            print(f"{indent}📄 Result: {result[:_RESULT_PREVIEW_CHARS]}{suffix}")
 
     async def on_agent_reply(self, message: str):
         """Handle agent reply to user"""
@@ -57,17 +68,33 @@ class CLICallbacks(AgentCallbacks):
             print(f"📊 Status: {status} (iteration {iteration})")
 
 
-async def agent_loop(user_message: str, max_iterations: int = 20, working_dir: str = ".", verbose: bool = False) -> str:
-    """Run the agent loop with CLI callbacks"""
+def _create_runtime(working_dir: str = ".", verbose: bool = False) -> AgentRuntime:
+    """Build an AgentRuntime wired to CLI callbacks"""
     state = AgentState(working_dir=working_dir)
     callbacks = CLICallbacks(verbose=verbose)
-    runtime = AgentRuntime(state, callbacks)
+    return AgentRuntime(state, callbacks)
+
+
+async def agent_loop(user_message: str, max_iterations: int = 20, working_dir: str = ".", verbose: bool = False) -> str:
+    """Run the agent loop with CLI callbacks"""
+    runtime = _create_runtime(working_dir, verbose)
 
     return await runtime.run_loop(user_message, max_iterations)
 
 
-def main():
-    """Main CLI entry point"""
+def _cancel_pending_tasks(loop) -> None:
+    """Cancel and drain tasks left on the session loop (e.g. after Ctrl-C)"""
+    pending = asyncio.all_tasks(loop)
+    if not pending:
+        return
+    for task in pending:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+
+@cache
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the tatty-agent argument parser (cached across calls)"""
     parser = argparse.ArgumentParser(
         description="TATty Agent - Agentic RAG Context Engineering Demo",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -129,42 +156,29 @@ Examples:
         help="Enable verbose output"
     )
 
+    return parser
+
+
+def main():
+    """Main CLI entry point"""
+    parser = _build_parser()
     args = parser.parse_args()
 
     # Launch TUI mode if requested
     if args.tui:
         from ..tui.app import run_tui
 
-        work_dir = None
-        if args.dir:
-            work_dir = Path(args.dir).resolve()
-            if not work_dir.exists():
-                print(f"❌ Error: Directory does not exist: {work_dir}")
-                sys.exit(1)
-            if not work_dir.is_dir():
-                print(f"❌ Error: Not a directory: {work_dir}")
-                sys.exit(1)
-            work_dir = str(work_dir)
+        work_dir = resolve_directory(args.dir) if args.dir else None
 
         run_tui(working_dir=work_dir, initial_query=args.query)
         return
 
     # Set working directory for CLI mode
-    if args.dir:
-        work_dir = str(Path(args.dir).resolve())
-        work_dir_path = Path(work_dir)
-        if not work_dir_path.exists():
-            print(f"❌ Error: Directory does not exist: {work_dir}")
-            sys.exit(1)
-        if not work_dir_path.is_dir():
-            print(f"❌ Error: Not a directory: {work_dir}")
-            sys.exit(1)
-
+    cwd = os.getcwd()
+    work_dir = resolve_directory(args.dir) if args.dir else cwd
+    if work_dir != cwd:
         os.chdir(work_dir)
-        print(f"📁 Working directory: {work_dir}")
-    else:
-        work_dir = os.getcwd()
-        print(f"📁 Working directory: {work_dir}")
+    print(f"📁 Working directory: {work_dir}")
 
     # Require query in non-interactive/non-TUI mode
     if not args.query and not args.interactive:
@@ -177,73 +191,99 @@ Examples:
     # Interactive loop or single command
     first_query = args.query
 
-    while True:
-        try:
-            if first_query:
-                query = first_query
-                first_query = None  # Only use the first query once
-            else:
-                print("\n" + "=" * 60)
-                query = input("📝 Enter your command (or 'exit' to quit): ").strip()
+    # One event loop for the whole session instead of a new loop per query
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    # Built on the first query and reset for later ones, so warmed clients
+    # persist across turns; construction errors go through the handler below
+    runtime = None
+
+    try:
+        while True:
+            try:
+                if first_query:
+                    query = first_query
+                    first_query = None  # Only use the first query once
+                else:
+                    print("\n" + "=" * 60)
+                    query = input("📝 Enter your command (or 'exit' to quit): ").strip()
+
+                    if not query:
+                        continue
+
+                    if query.lower() in ['exit', 'quit', 'q']:
+                        print("👋 Goodbye!")
+                        break
+
+                # Skip generic startup commands that don't provide meaningful tasks
+                if query.strip().lower() in ["start", "begin", "go"]:
+                    print(f"\n📝 Query: {query}")
+                    print("🚀 TATty Agent ready! Please enter a specific command or task.")
+                    print("💡 Examples: 'List files', 'Search for Python functions', 'Explain this code'")
+                    if not args.interactive:
+                        break  # In non-interactive mode, exit after showing help
+                    continue  # In interactive mode, ask for another command
+
+                print(f"\n📝 Query: {query}")
+                print("🔄 Running agent...")
+                print("=" * 60)
+
+                # Run the agent (each query starts from a clean conversation)
+                if runtime is None:
+                    runtime = _create_runtime(work_dir, args.verbose)
+                else:
+                    runtime.reset()
+                result = loop.run_until_complete(runtime.run_loop(query, max_iterations=20))
 
-                if not query:
-                    continue
+                print(f"\n{'='*60}")
+                print(f"✅ Final result:\n{result}")
+                print(f"{'='*60}")
 
-                if query.lower() in ['exit', 'quit', 'q']:
-                    print("👋 Goodbye!")
+                # If not in interactive mode, exit after first query
+                if not args.interactive:
                     break
 
-            # Skip generic startup commands that don't provide meaningful tasks
-            if query.strip().lower() in ["start", "begin", "go"]:
-                print(f"\n📝 Query: {query}")
-                print("🚀 TATty Agent ready! Please enter a specific command or task.")
-                print("💡 Examples: 'List files', 'Search for Python functions', 'Explain this code'")
+            except KeyboardInterrupt:
+                print("\n\n⚠️  Interrupted by user")
+                # Don't let the interrupted query resume on the next run_until_complete
+                _cancel_pending_tasks(loop)
+                if args.interactive:
+                    continue  # Go back to prompt
+                else:
+                    sys.exit(130)
+            except Exception as e:
+                print(f"\n\n❌ Error: {e}")
+                if args.verbose:
+                    import traceback
+                    traceback.print_exc()
                 if not args.interactive:
-                    break  # In non-interactive mode, exit after showing help
-                continue  # In interactive mode, ask for another command
-
-            print(f"\n📝 Query: {query}")
-            print("🔄 Running agent...")
-            print("=" * 60)
-
-            # Run the agent
-            result = asyncio.run(agent_loop(query, max_iterations=20, working_dir=work_dir, verbose=args.verbose))
-
-            print(f"\n{'='*60}")
-            print(f"✅ Final result:\n{result}")
-            print(f"{'='*60}")
-
-            # If not in interactive mode, exit after first query
-            if not args.interactive:
-                break
-
-        except KeyboardInterrupt:
-            print("\n\n⚠️  Interrupted by user")
-            if args.interactive:
-                continue  # Go back to prompt
-            else:
-                sys.exit(130)
-        except Exception as e:
-            print(f"\n\n❌ Error: {e}")
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
-            if not args.interactive:
-                sys.exit(1)
-            # In interactive mode, continue to next query
+                    sys.exit(1)
+                # In interactive mode, continue to next query
+    finally:
+        _cancel_pending_tasks(loop)
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        asyncio.set_event_loop(None)
+        loop.close()
 
 
 def cli_main():
     """Entry point for the tatty-agent command-line script"""
+    # --help exits from argparse before any agent work, so skip loading .env for it
+    if "-h" in sys.argv[1:] or "--help" in sys.argv[1:]:
+        main()
+        return
+
+    from dotenv import load_dotenv
+
     # Load .env file with override=True to override shell environment variables
     load_dotenv(override=True)
 
-    # Print loaded keys for verification
-    openai_key = os.getenv("OPENAI_API_KEY")
-    boundary_key = os.getenv("BOUNDARY_API_KEY")
-
-    print(f"🔑 OpenAI API Key loaded: {openai_key[-6:] if openai_key else 'Not found'}")
-    print(f"🔑 Boundary API Key loaded: {boundary_key[-6:] if boundary_key else 'Not found'}")
+    # Print loaded keys for verification (read after load_dotenv has updated the env)
+    environ = os.environ
+    for label, env_var in (("OpenAI", "OPENAI_API_KEY"), ("Boundary", "BOUNDARY_API_KEY")):
+        key = environ.get(env_var)
+        print(f"🔑 {label} API Key loaded: {key[-6:] if key else 'Not found'}")
 
     main()
 
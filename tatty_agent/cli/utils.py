@@ -0,0 +1,29 @@
+"""
+Shared helpers for the TATty Agent command-line entry points
+"""
+import os
+import stat
+import sys
+from pathlib import Path
+
+
+def resolve_directory(arg: str) -> str:
+    """
+    Resolve a directory argument and validate it with a single stat() call.
+
+    Prints an error and exits if the path is missing or not a directory.
+    """
+    path = Path(arg).resolve(strict=False)
+    try:
+        st = os.stat(path)
+    except OSError:
+        # Missing paths, a file used as a parent (NotADirectoryError) and
+        # unreadable parents all mean the directory can't be used
+        print(f"❌ Error: Directory does not exist: {path}")
+        sys.exit(1)
+
+    if not stat.S_ISDIR(st.st_mode):
+        print(f"❌ Error: Not a directory: {path}")
+        sys.exit(1)
+
+    return str(path)
@@ -11,6 +11,71 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 
+_ENV_TEMPLATE = """# TATty Agent Environment Configuration
+# Copy this file and fill in your API keys
+
+# OpenAI API Key (for GPT models)
+OPENAI_API_KEY=your_openai_key_here
+
+# Boundary ML API Key (for BAML)
+BOUNDARY_API_KEY=your_boundary_key_here
+
+# Optional: Specify working directory
+# TATTY_WORKING_DIR=.
+
+# Optional: Model preferences
+# TATTY_DEFAULT_MODEL=gpt-4
+# TATTY_FAST_MODEL=gpt-3.5-turbo
+
+# Optional: Enable debug mode
+# TATTY_DEBUG=false
+"""
+
+_GITIGNORE_ADDITIONS = """
+# TATty Agent generated files
+.tatty/
+*.tatty.log
+.mypy_cache/
+__pycache__/
+*.pyc
+*.pyo
+.pytest_cache/
+
+# Environment files
+.env
+.env.local
+.env.*.local
+
+# BAML generated files
+baml_client/
+"""
+
+
+def _entry_names(directory: Path) -> set[str]:
+    """
+    Names in a directory from a single scandir pass (empty if missing).
+
+    Symlinks are followed like Path.exists(), so broken links are left out.
+    """
+    try:
+        with os.scandir(directory) as it:
+            return {
+                entry.name for entry in it
+                if not entry.is_symlink() or os.path.exists(entry.path)
+            }
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+def _count_entries(directory: Path) -> int:
+    """Count entries, as len(list(directory.glob('*'))) would (0 if not a directory)"""
+    try:
+        with os.scandir(directory) as it:
+            return sum(1 for _ in it)
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
+
+
 class ProjectInitializer:
     """Handles project setup and artifact folder management"""
 
@@ -42,10 +107,13 @@ class ProjectInitializer:
         }
 
         try:
-            # Create standard artifact folders
+            # One directory read tells us which folders and files already exist
+            present = _entry_names(self.project_root)
+
+            # Create standard artifact folders that are missing
             for folder, description in self.standard_folders.items():
-                folder_path = self.project_root / folder
-                if not folder_path.exists():
+                if folder not in present:
+                    folder_path = self.project_root / folder
                     folder_path.mkdir(parents=True, exist_ok=True)
                     results["created_folders"].append(str(folder))
 
@@ -57,62 +125,24 @@ class ProjectInitializer:
 
             # Create .env template
             env_path = self.project_root / ".env"
-            if not env_path.exists() or force:
-                env_content = """# TATty Agent Environment Configuration
-# Copy this file and fill in your API keys
-
-# OpenAI API Key (for GPT models)
-OPENAI_API_KEY=your_openai_key_here
-
-# Boundary ML API Key (for BAML)
-BOUNDARY_API_KEY=your_boundary_key_here
-
-# Optional: Specify working directory
-# TATTY_WORKING_DIR=.
-
-# Optional: Model preferences
-# TATTY_DEFAULT_MODEL=gpt-4
-# TATTY_FAST_MODEL=gpt-3.5-turbo
-
-# Optional: Enable debug mode
-# TATTY_DEBUG=false
-"""
-                env_path.write_text(env_content)
+            if ".env" not in present or force:
+                env_path.write_text(_ENV_TEMPLATE)
                 results["created_files"].append(".env")
             else:
                 results["existing_files"].append(".env")
 
             # Create .gitignore additions
             gitignore_path = self.project_root / ".gitignore"
-            gitignore_additions = """
-# TATty Agent generated files
-.tatty/
-*.tatty.log
-.mypy_cache/
-__pycache__/
-*.pyc
-*.pyo
-.pytest_cache/
-
-# Environment files
-.env
-.env.local
-.env.*.local
-
-# BAML generated files
-baml_client/
-"""
-
-            if gitignore_path.exists():
+            if ".gitignore" in present:
                 # Append to existing .gitignore if TATty section doesn't exist
                 existing_content = gitignore_path.read_text()
                 if "# TATty Agent generated files" not in existing_content:
-                    gitignore_path.write_text(existing_content + gitignore_additions)
+                    gitignore_path.write_text(existing_content + _GITIGNORE_ADDITIONS)
                     results["created_files"].append(".gitignore (updated)")
                 else:
                     results["existing_files"].append(".gitignore (TATty section exists)")
             else:
-                gitignore_path.write_text(gitignore_additions.strip())
+                gitignore_path.write_text(_GITIGNORE_ADDITIONS.strip())
                 results["created_files"].append(".gitignore")
 
             # Copy BAML template assets
@@ -207,16 +237,18 @@ warn_unused_configs = true
             "recommendations": []
         }
 
+        present = _entry_names(self.project_root)
+
         # Check folders
         for folder, description in self.standard_folders.items():
-            folder_path = self.project_root / folder
+            exists = folder in present
             status["folders"][folder] = {
-                "exists": folder_path.exists(),
+                "exists": exists,
                 "description": description,
-                "file_count": len(list(folder_path.glob("*"))) if folder_path.exists() else 0
+                "file_count": _count_entries(self.project_root / folder) if exists else 0
             }
 
-            if not folder_path.exists():
+            if not exists:
                 status["initialized"] = False
                 status["missing"].append(f"folder: {folder}")
 
@@ -228,8 +260,7 @@ warn_unused_configs = true
         }
 
         for file, description in important_files.items():
-            file_path = self.project_root / file
-            exists = file_path.exists()
+            exists = file.rstrip("/") in present
             status["files"][file] = {
                 "exists": exists,
                 "description": description
@@ -242,10 +273,10 @@ warn_unused_configs = true
         if not status["initialized"]:
             status["recommendations"].append("Run 'tatty-init' to initialize the project")
 
-        if not (self.project_root / ".env").exists():
+        if ".env" not in present:
             status["recommendations"].append("Create .env file with your API keys")
 
-        if not (self.project_root / "baml_src").exists():
+        if "baml_src" not in present:
             status["recommendations"].append("Set up BAML configuration for custom tools")
 
         return status
@@ -7,14 +7,22 @@ This module handles configuration loading from various sources:
 - Programmatic configuration
 - CLI arguments
 """
+import copy
 import os
+import re
 import sys
+import threading
+from collections.abc import Callable
+from functools import cache, lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, Union
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 
 
-@dataclass
+_VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+
+
+@dataclass(slots=True)
 class TattyConfig:
     """Configuration class for TATty Agent"""
 
@@ -53,15 +61,24 @@ class TattyConfig:
     log_level: str = "INFO"
 
     # Internal settings
-    _config_sources: list = field(default_factory=list)
+    _config_sources: list[str] | None = None  # Created on first recorded source
+    # (working_dir, cwd, resolved path) from the last resolved_working_dir lookup
+    _resolved_working_dir: tuple[str, str, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         """Validate configuration after initialization"""
-        self.working_dir = str(Path(self.working_dir).resolve())
+        # getcwd() is already the resolved form of the default ".", so only
+        # explicit paths need the per-component lstat() walk of resolve()
+        if self.working_dir == ".":
+            self.working_dir = os.getcwd()
+        else:
+            self.working_dir = str(Path(self.working_dir).resolve())
 
-        # Ensure log level is valid
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if self.log_level.upper() not in valid_levels:
+        # Ensure log level is valid; canonical upper-case names skip the upper() copy
+        log_level = self.log_level
+        if log_level not in _VALID_LOG_LEVELS and log_level.upper() not in _VALID_LOG_LEVELS:
             self.log_level = "INFO"
 
         # Validate model names
@@ -70,6 +87,163 @@ class TattyConfig:
         if not self.fast_model:
             self.fast_model = "gpt-3.5-turbo"
 
+    @property
+    def resolved_working_dir(self) -> str:
+        """Absolute working directory (working_dir may be reassigned to a relative path)"""
+        working_dir = self.working_dir
+        cwd = os.getcwd()
+        cached = self._resolved_working_dir
+        if cached is None or cached[0] != working_dir or cached[1] != cwd:
+            cached = (working_dir, cwd, str(Path(working_dir).resolve()))
+            self._resolved_working_dir = cached
+        return cached[2]
+
+
+_TRUTHY_VALUES = frozenset({'true', '1', 'yes', 'on', 'enabled'})
+
+
+def _to_bool(value: str) -> bool:
+    """Interpret a string environment value as a boolean"""
+    return value.lower() in _TRUTHY_VALUES
+
+
+# Field type -> string-to-value converter; anything else stays a string
+_TYPE_CONVERTERS: dict[Any, Callable[[str], Any]] = {
+    bool: _to_bool,
+    int: int,
+    float: float,
+}
+
+
+def _field_type(annotation: Any) -> Any:
+    """Unwrap Optional[T] to T"""
+    if getattr(annotation, '__origin__', None) is Union:
+        non_none_types = [t for t in annotation.__args__ if t is not type(None)]
+        if non_none_types:
+            return non_none_types[0]
+    return annotation
+
+
+# Converter for every TattyConfig field, built once from the dataclass fields
+_FIELD_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    f.name: _TYPE_CONVERTERS.get(_field_type(f.type), str) for f in fields(TattyConfig)
+}
+
+# Settings that dicts and overrides may set; hasattr() would also accept the
+# resolved_working_dir property and the internal fields
+_PUBLIC_FIELD_NAMES = frozenset(f.name for f in fields(TattyConfig) if not f.name.startswith('_'))
+
+
+# Environment variable suffixes and the config fields they set. Entries
+# marked False are read without the prefix (standard API key names).
+_ENV_FIELDS: tuple[tuple[str, str, bool], ...] = (
+    ("OPENAI_API_KEY", "openai_api_key", True),
+    ("BOUNDARY_API_KEY", "boundary_api_key", True),
+    ("OPENAI_API_KEY", "openai_api_key", False),  # Also check standard names
+    ("BOUNDARY_API_KEY", "boundary_api_key", False),
+    ("WORKING_DIR", "working_dir", True),
+    ("DEFAULT_MODEL", "default_model", True),
+    ("FAST_MODEL", "fast_model", True),
+    ("MAX_ITERATIONS", "max_iterations", True),
+    ("TIMEOUT", "timeout", True),
+    ("VERBOSE", "verbose", True),
+    ("DEBUG", "debug", True),
+    ("COLORIZE", "colorize", True),
+    ("ENABLE_WEB_TOOLS", "enable_web_tools", True),
+    ("ENABLE_GIT_TOOLS", "enable_git_tools", True),
+    ("ENABLE_PACKAGE_INSTALL", "enable_package_install", True),
+    ("REQUIRE_CONFIRMATION", "require_confirmation", True),
+    ("SANDBOX_MODE", "sandbox_mode", True),
+    ("CUSTOM_TOOLS_DIR", "custom_tools_dir", True),
+    ("BAML_CONFIG_PATH", "baml_config_path", True),
+    ("LOG_LEVEL", "log_level", True),
+)
+
+
+@cache
+def _env_mappings(prefix: str) -> tuple[tuple[str, str, Callable[[str], Any]], ...]:
+    """Build (env_var, config_attr, coercer) triples for a variable prefix"""
+    return tuple(
+        (f"{prefix}{suffix}" if prefixed else suffix, attr, _FIELD_CONVERTERS.get(attr, str))
+        for suffix, attr, prefixed in _ENV_FIELDS
+    )
+
+
+_ENV_MAPPINGS = _env_mappings("TATTY_")
+_ENV_VAR_NAMES = tuple(env_var for env_var, _, _ in _ENV_MAPPINGS)
+
+# KEY=VALUE lines of a .env file; values may be quoted, and unquoted values
+# may be followed by a " # comment". Comment and blank lines never match.
+_ENV_LINE_RE = re.compile(
+    r"""^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"""
+    r"""(?:"([^"\n]*)"|'([^'\n]*)'|([^\n]*?))[ \t]*(?:[ \t]#[^\n]*)?$""",
+    re.MULTILINE,
+)
+
+
+def _find_config_file(working_dir: str) -> str | None:
+    """Find the first .env file in the common locations"""
+    # One directory scan covers .env and .env.local in the current directory
+    try:
+        with os.scandir(".") as it:
+            cwd_files = {entry.name for entry in it if entry.name.startswith(".env")}
+    except OSError:
+        cwd_files = set()
+
+    for name in (".env", ".env.local"):
+        if name in cwd_files:
+            return name
+
+    config_env = os.path.join("config", ".env")
+    if os.path.exists(config_env):
+        return config_env
+
+    # The working directory's .env was already covered by the scan above
+    working_dir = os.path.abspath(working_dir)
+    if working_dir != os.getcwd():
+        working_env = os.path.join(working_dir, ".env")
+        if os.path.exists(working_env):
+            return working_env
+
+    return None
+
+
+def _load_env_file(file_path: str) -> str | None:
+    """
+    Apply a .env file to os.environ.
+
+    Returns how it was read ("file" with python-dotenv, "manual_file" otherwise),
+    or None if it could not be parsed.
+    """
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        # dotenv not available, try manual parsing
+        return "manual_file" if _parse_env_file(file_path) else None
+
+    load_dotenv(file_path, override=False)
+    return "file"
+
+
+def _parse_env_file(file_path: str) -> bool:
+    """Manually parse .env file when dotenv is not available"""
+    try:
+        text = Path(file_path).read_text(encoding='utf-8')
+    except Exception:
+        # Silently fail if we can't read the file
+        return False
+
+    environ = os.environ
+    for match in _ENV_LINE_RE.finditer(text):
+        key, double_quoted, single_quoted, bare = match.groups()
+        if double_quoted is not None:
+            environ[key] = double_quoted
+        elif single_quoted is not None:
+            environ[key] = single_quoted
+        else:
+            environ[key] = bare
+    return True
+
 
 class ConfigLoader:
     """Loads configuration from various sources"""
@@ -79,160 +253,97 @@ class ConfigLoader:
 
     def load_from_env(self, prefix: str = "TATTY_") -> 'ConfigLoader':
         """Load configuration from environment variables"""
-        env_mappings = {
-            f"{prefix}OPENAI_API_KEY": "openai_api_key",
-            f"{prefix}BOUNDARY_API_KEY": "boundary_api_key",
-            "OPENAI_API_KEY": "openai_api_key",  # Also check standard names
-            "BOUNDARY_API_KEY": "boundary_api_key",
-            f"{prefix}WORKING_DIR": "working_dir",
-            f"{prefix}DEFAULT_MODEL": "default_model",
-            f"{prefix}FAST_MODEL": "fast_model",
-            f"{prefix}MAX_ITERATIONS": "max_iterations",
-            f"{prefix}TIMEOUT": "timeout",
-            f"{prefix}VERBOSE": "verbose",
-            f"{prefix}DEBUG": "debug",
-            f"{prefix}COLORIZE": "colorize",
-            f"{prefix}ENABLE_WEB_TOOLS": "enable_web_tools",
-            f"{prefix}ENABLE_GIT_TOOLS": "enable_git_tools",
-            f"{prefix}ENABLE_PACKAGE_INSTALL": "enable_package_install",
-            f"{prefix}REQUIRE_CONFIRMATION": "require_confirmation",
-            f"{prefix}SANDBOX_MODE": "sandbox_mode",
-            f"{prefix}CUSTOM_TOOLS_DIR": "custom_tools_dir",
-            f"{prefix}BAML_CONFIG_PATH": "baml_config_path",
-            f"{prefix}LOG_LEVEL": "log_level",
-        }
-
-        for env_var, config_attr in env_mappings.items():
-            value = os.getenv(env_var)
+        mappings = _ENV_MAPPINGS if prefix == "TATTY_" else _env_mappings(prefix)
+        environ = os.environ
+
+        for env_var, config_attr, cast in mappings:
+            value = environ.get(env_var)
             if value is not None:
                 # Convert string values to appropriate types
-                config_value = self._convert_env_value(config_attr, value)
+                try:
+                    config_value = cast(value)
+                except ValueError:
+                    continue  # Keep current value
                 setattr(self.config, config_attr, config_value)
-                self.config._config_sources.append(f"env:{env_var}")
+                self._record_source(f"env:{env_var}")
 
         return self
 
     def load_from_file(self, config_path: Optional[str] = None) -> 'ConfigLoader':
         """Load configuration from .env file"""
         if config_path is None:
-            # Try common locations
-            possible_paths = [
-                Path(".env"),
-                Path(".env.local"),
-                Path("config/.env"),
-                Path(self.config.working_dir) / ".env"
-            ]
-
-            for path in possible_paths:
-                if path.exists():
-                    config_path = str(path)
-                    break
-
-        if config_path and Path(config_path).exists():
-            try:
-                from dotenv import load_dotenv
-                load_dotenv(config_path, override=False)
-                self.config._config_sources.append(f"file:{config_path}")
-
-                # Re-load from environment after loading .env
-                self.load_from_env()
-            except ImportError:
-                # dotenv not available, try manual parsing
-                self._parse_env_file(config_path)
+            config_path = _find_config_file(self.config.working_dir)
+        elif not Path(config_path).exists():
+            config_path = None
+
+        if config_path:
+            self._use_env_file(config_path, _load_env_file(config_path))
 
         return self
 
+    def _use_env_file(self, config_path: str, loaded_as: str | None) -> None:
+        """Record a .env file already applied to os.environ by _load_env_file"""
+        if loaded_as is None:
+            return
+        self._record_source(f"{loaded_as}:{config_path}")
+        if loaded_as == "file":
+            # Re-load from environment after loading .env
+            self.load_from_env()
+
     def load_from_dict(self, config_dict: Dict[str, Any]) -> 'ConfigLoader':
         """Load configuration from a dictionary"""
         for key, value in config_dict.items():
-            if hasattr(self.config, key):
+            if key in _PUBLIC_FIELD_NAMES:
                 setattr(self.config, key, value)
-                self.config._config_sources.append(f"dict:{key}")
+                self._record_source(f"dict:{key}")
 
         return self
 
     def override_from_args(self, **kwargs) -> 'ConfigLoader':
         """Override configuration with direct arguments"""
         for key, value in kwargs.items():
-            if hasattr(self.config, key) and value is not None:
+            if key in _PUBLIC_FIELD_NAMES and value is not None:
                 setattr(self.config, key, value)
-                self.config._config_sources.append(f"arg:{key}")
+                self._record_source(f"arg:{key}")
 
         return self
 
+    def _record_source(self, source: str) -> None:
+        """Remember where a setting came from (shown by print_config_info in debug mode)"""
+        if self.config._config_sources is None:
+            self.config._config_sources = []
+        self.config._config_sources.append(source)
+
     def get_config(self) -> TattyConfig:
         """Get the final configuration"""
         return self.config
 
-    def _convert_env_value(self, attr_name: str, value: str) -> Any:
-        """Convert string environment values to appropriate types"""
-        # Get the type hint from the config class
-        config_field_type = TattyConfig.__annotations__.get(attr_name, str)
-
-        # Handle Optional types
-        if hasattr(config_field_type, '__origin__'):
-            if config_field_type.__origin__ is Union:
-                # Get the non-None type from Optional[T]
-                non_none_types = [t for t in config_field_type.__args__ if t is not type(None)]
-                if non_none_types:
-                    config_field_type = non_none_types[0]
-
-        # Convert based on type
-        if config_field_type is bool:
-            return value.lower() in ('true', '1', 'yes', 'on', 'enabled')
-        elif config_field_type is int:
-            try:
-                return int(value)
-            except ValueError:
-                return getattr(self.config, attr_name)  # Keep current value
-        elif config_field_type is float:
-            try:
-                return float(value)
-            except ValueError:
-                return getattr(self.config, attr_name)  # Keep current value
-        else:
-            return value
 
-    def _parse_env_file(self, file_path: str) -> None:
-        """Manually parse .env file when dotenv is not available"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-
-                    # Skip empty lines and comments
-                    if not line or line.startswith('#'):
-                        continue
-
-                    # Parse KEY=VALUE pairs
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-
-                        # Remove quotes if present
-                        if value.startswith('"') and value.endswith('"'):
-                            value = value[1:-1]
-                        elif value.startswith("'") and value.endswith("'"):
-                            value = value[1:-1]
-
-                        # Set in environment
-                        os.environ[key] = value
-
-            self.config._config_sources.append(f"manual_file:{file_path}")
-        except Exception as e:
-            # Silently fail if we can't parse the file
-            pass
-
-
-def load_config(
-    config_path: Optional[str] = None,
-    working_dir: Optional[str] = None,
-    **overrides
+# A .env file as seen by load_config: (path, how it was loaded, mtime)
+_EnvFile = tuple[str, str | None, float]
+
+
+@lru_cache(maxsize=16)
+def _load_config_cached(
+    working_dir: str | None,
+    override_items: tuple[tuple[str, Any], ...],
+    env_file: _EnvFile | None,
+    cwd: str,
+    env_values: tuple[str | None, ...],
 ) -> TattyConfig:
+    """Cached load_config; cwd and env_values only take part in the cache key"""
+    return _load_config_uncached(working_dir, dict(override_items), env_file)
+
+
+class _CachedConfigLoader:
     """
     Load configuration from all available sources
 
+    Results are cached per argument set, current directory, .env file
+    (path and modification time) and configuration environment variables;
+    every call returns its own copy. Use load_config.cache_clear() to force
+    a reload.
+
     Args:
         config_path: Path to .env file
         working_dir: Override working directory
@@ -241,13 +352,86 @@ def load_config(
     Returns:
         Configured TattyConfig instance
     """
+
+    def __init__(self) -> None:
+        # How each .env file version, by (absolute path, mtime), was applied to os.environ
+        self._applied_env_files: dict[tuple[str, float], str | None] = {}
+
+    def __call__(
+        self,
+        config_path: str | None = None,
+        working_dir: str | None = None,
+        **overrides: Any,
+    ) -> TattyConfig:
+        """Load configuration (see the class docstring)"""
+        # Read the environment only after the .env file has been applied to it,
+        # otherwise the first load changes the key and the next call misses
+        env_file = self._apply_env_file(config_path)
+
+        override_items = tuple(sorted(overrides.items()))
+        try:
+            hash(override_items)
+        except TypeError:
+            # Unhashable override values can't be cached
+            return _load_config_uncached(working_dir, overrides, env_file)
+
+        environ = os.environ
+        config = _load_config_cached(
+            working_dir,
+            override_items,
+            env_file,
+            os.getcwd(),
+            tuple([environ.get(name) for name in _ENV_VAR_NAMES]),
+        )
+        return _copy_config(config)
+
+    def cache_clear(self) -> None:
+        """Drop cached configurations, e.g. after editing a .env file"""
+        _load_config_cached.cache_clear()
+        self._applied_env_files.clear()
+
+    def _apply_env_file(self, config_path: str | None) -> _EnvFile | None:
+        """Apply the .env file load_config reads, once per file version"""
+        if config_path is None:
+            # The file search runs after TATTY_WORKING_DIR has been read
+            path = _find_config_file(os.environ.get("TATTY_WORKING_DIR", "."))
+        elif os.path.exists(config_path):
+            path = config_path
+        else:
+            path = None
+        if not path:
+            return None
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+
+        version = (os.path.abspath(path), mtime)
+        try:
+            loaded_as = self._applied_env_files[version]
+        except KeyError:
+            loaded_as = self._applied_env_files[version] = _load_env_file(path)
+        return (path, loaded_as, mtime)
+
+
+load_config = _CachedConfigLoader()
+
+
+def _load_config_uncached(
+    working_dir: str | None,
+    overrides: dict[str, Any],
+    env_file: _EnvFile | None,
+) -> TattyConfig:
+    """Build a TattyConfig from the environment, an applied .env file and overrides"""
     loader = ConfigLoader()
 
     # Load from environment first
     loader.load_from_env()
 
-    # Load from file (if available)
-    loader.load_from_file(config_path)
+    # The .env file itself was already applied to os.environ by load_config
+    if env_file is not None:
+        path, loaded_as, _ = env_file
+        loader._use_env_file(path, loaded_as)
 
     # Apply direct overrides
     if working_dir:
@@ -259,6 +443,14 @@ def load_config(
     return loader.get_config()
 
 
+def _copy_config(config: TattyConfig) -> TattyConfig:
+    """Copy a cached config so callers can't change the cached instance"""
+    config = copy.copy(config)
+    if config._config_sources is not None:
+        config._config_sources = list(config._config_sources)
+    return config
+
+
 def get_default_config() -> TattyConfig:
     """Get a default configuration (useful for testing)"""
     return TattyConfig()
@@ -267,7 +459,7 @@ def get_default_config() -> TattyConfig:
 def print_config_info(config: TattyConfig) -> None:
     """Print configuration information for debugging"""
     print("📋 TATty Agent Configuration:")
-    print(f"  Working Directory: {config.working_dir}")
+    print(f"  Working Directory: {config.resolved_working_dir}")
     print(f"  Default Model: {config.default_model}")
     print(f"  Fast Model: {config.fast_model}")
     print(f"  Max Iterations: {config.max_iterations}")
@@ -288,17 +480,24 @@ def print_config_info(config: TattyConfig) -> None:
 
 # Global config instance (can be overridden)
 _global_config: Optional[TattyConfig] = None
+_global_config_lock = threading.Lock()
 
 
 def get_global_config() -> TattyConfig:
     """Get the global configuration instance"""
     global _global_config
-    if _global_config is None:
-        _global_config = load_config()
-    return _global_config
+    config = _global_config
+    if config is None:
+        # Double-checked so concurrent first callers load the config only once
+        with _global_config_lock:
+            if _global_config is None:
+                _global_config = load_config()
+            config = _global_config
+    return config
 
 
 def set_global_config(config: TattyConfig) -> None:
     """Set the global configuration instance"""
     global _global_config
-    _global_config = config
\ No newline at end of file
+    with _global_config_lock:
+        _global_config = config
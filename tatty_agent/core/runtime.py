@@ -1,6 +1,7 @@
 """
 Core agent runtime - shared between CLI, TUI, and library modes
 """
+import asyncio
 from typing import Optional
 
 from ..baml_client import types
@@ -17,12 +18,25 @@ class AgentRuntime:
     # Global state reference for interrupt checking from tools
     _current_state: Optional[AgentState] = None
 
+    # Pause between streamed reply characters; 0 streams without pacing
+    response_chunk_delay: float = 0.02
+
     def __init__(self, state: AgentState, callbacks: Optional[AgentCallbacks] = None):
         self.state = state
         self.callbacks = callbacks or AgentCallbacks()
         # Set global state reference for tool interrupt checking
         AgentRuntime._current_state = state
 
+    def reset(self) -> None:
+        """Clear per-query state so the runtime can be reused for a new query"""
+        self.state.messages = []
+        self.state.todos = []
+        self.state.interrupt_requested = False
+        self.state.current_iteration = 0
+        self.state.current_depth = 0
+        self.state.last_response = None
+        AgentRuntime._current_state = self.state
+
     # @trace
     async def execute_tool(self, tool: types.AgentTools, depth: int = 0) -> str:
         """Execute a tool, handling sub-agents specially"""
@@ -189,13 +203,14 @@ class AgentRuntime:
             # Stream response if streaming callback is available
             if self.callbacks.on_response_chunk:
                 # Character-by-character streaming for real-time experience
-                import asyncio
-                response_text = response.message
-
-                for i, char in enumerate(response_text):
-                    await self.callbacks.on_response_chunk(char)
-                    # Add small delay for realistic typing speed (20ms per character)
-                    await asyncio.sleep(0.02)
+                on_response_chunk = self.callbacks.on_response_chunk
+                delay = self.response_chunk_delay
+
+                for char in response.message:
+                    await on_response_chunk(char)
+                    # Small delay for realistic typing speed (20ms per character by default)
+                    if delay:
+                        await asyncio.sleep(delay)
             elif self.callbacks.on_agent_reply:
                 # Fallback to regular reply callback
                 await self.callbacks.on_agent_reply(response.message)
@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 from ..baml_client import types
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     """Shared state for agent execution"""
     messages: list[types.Message] = field(default_factory=list)
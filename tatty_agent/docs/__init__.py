@@ -18,9 +18,12 @@ docs_path = get_docs_dir()
 ```
 """
 
+import os
+from functools import cache
 from pathlib import Path
 from typing import Optional
 
+@cache
 def get_docs_dir() -> Path:
     """Get the documentation directory path"""
     return Path(__file__).parent
@@ -52,10 +55,12 @@ def read_doc(name: str) -> Optional[str]:
     Returns:
         Content of the file, or None if not found
     """
-    doc_path = get_doc_path(name)
-    if doc_path:
-        return doc_path.read_text()
-    return None
+    # Open directly instead of checking exists() first: one lookup, not two
+    try:
+        return (get_docs_dir() / name).read_text()
+    except (FileNotFoundError, NotADirectoryError):
+        # Missing file, or a file name used as a directory ("README.md/x")
+        return None
 
 def show_readme():
     """Display the main README documentation"""
@@ -85,8 +90,10 @@ def show_distribution_guide():
 
 def list_docs() -> list:
     """List all available documentation files"""
-    docs_dir = get_docs_dir()
-    return [f.name for f in docs_dir.glob("*") if f.is_file() and f.name != "__init__.py"]
+    # DirEntry.is_file() reuses the type from the directory read instead of stat-ing
+    with os.scandir(get_docs_dir()) as entries:
+        return [entry.name for entry in entries
+                if entry.name != "__init__.py" and entry.is_file()]
 
 __all__ = [
     'get_docs_dir',
@@ -0,0 +1,130 @@
+"""
+Implementation of the tatty_agent.examples helpers
+
+Loaded on first attribute access from the package so that importing
+tatty_agent.examples stays cheap until an example is actually requested.
+"""
+import os
+import shutil
+from functools import cache, lru_cache
+from pathlib import Path
+
+
+@cache
+def get_examples_dir() -> Path:
+    """Get the examples directory path"""
+    return Path(__file__).parent
+
+@lru_cache(maxsize=1)
+def _scan_examples() -> tuple:
+    """Scan the examples directory once (shipped examples don't change at runtime)"""
+    files = []
+    with os.scandir(get_examples_dir()) as entries:
+        for entry in entries:
+            name = entry.name
+            # Skip __init__.py and private modules such as this one
+            if name.endswith(".ipynb") or (name.endswith(".py") and not name.startswith("_")):
+                if entry.is_file():
+                    files.append(Path(entry.path))
+    return tuple(sorted(files, key=lambda path: path.stem))
+
+@lru_cache(maxsize=1)
+def _example_index() -> dict[str, Path]:
+    """Map example names to files, preferring .ipynb over .py"""
+    index = {}
+    for path in _scan_examples():
+        if path.suffix == ".ipynb" or path.stem not in index:
+            index[path.stem] = path
+    return index
+
+def _clear_example_cache() -> None:
+    """Forget the cached scan so files added at runtime are picked up"""
+    _scan_examples.cache_clear()
+    _example_index.cache_clear()
+
+def list_examples() -> list[str]:
+    """List all available example files"""
+    return [path.stem for path in _scan_examples()]
+
+def get_example_notebook(name: str) -> Path | None:
+    """
+    Get path to a specific example notebook.
+
+    Args:
+        name: Name of the example (without extension)
+
+    Returns:
+        Path to the example file, or None if not found
+    """
+    return _example_index().get(name)
+
+def show_hello_world():
+    """Display information about the Hello World notebook"""
+    hello_path = get_example_notebook("hello_world")
+
+    if hello_path:
+        print("🚀 TATty Agent Hello World")
+        print(f"📍 Location: {hello_path}")
+        print()
+        print("Perfect for getting started! This 5-minute intro covers:")
+        print("✅ Basic agent usage")
+        print("✅ Magic commands (%tatty)")
+        print("✅ Data analysis example")
+        print("✅ Project understanding")
+        print()
+        print("Quick start:")
+        print("  jupyter lab")
+        print("  # Open hello_world.ipynb and run all cells")
+
+        return str(hello_path)
+    else:
+        print("❌ Hello World notebook not found")
+        return None
+
+def show_jupyter_demo():
+    """Display information about the comprehensive Jupyter demo notebook"""
+    demo_path = get_example_notebook("tatty_agent_jupyter_demo")
+
+    if demo_path:
+        print("🎯 TATty Agent Comprehensive Demo")
+        print(f"📍 Location: {demo_path}")
+        print()
+        print("Advanced features demonstration:")
+        print("✅ Interactive chat widgets")
+        print("✅ Live tool execution tracking")
+        print("✅ Rich display formatting")
+        print("✅ Notebook variable manipulation")
+        print()
+        print("After you've tried hello_world.ipynb!")
+
+        return str(demo_path)
+    else:
+        print("❌ Jupyter demo notebook not found")
+        return None
+
+def copy_example(name: str, destination: str = ".") -> Path | None:
+    """
+    Copy an example to a destination directory.
+
+    Args:
+        name: Name of the example to copy
+        destination: Destination directory (default: current directory)
+
+    Returns:
+        Path to the copied file, or None if source not found
+    """
+    source = get_example_notebook(name)
+    if not source:
+        print(f"❌ Example '{name}' not found")
+        return None
+
+    dest_dir = Path(destination)
+    if destination != ".":  # The current directory always exists
+        dest_dir.mkdir(exist_ok=True)
+
+    # Data-only copy: example notebooks don't need their package metadata
+    dest_path = dest_dir / source.name
+    shutil.copyfile(source, dest_path)
+
+    print(f"✅ Copied {source.name} to {dest_path}")
+    return dest_path
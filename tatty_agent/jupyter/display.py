@@ -7,6 +7,10 @@ and embedded artifacts.
 """
 import json
 import base64
+import itertools
+import os
+import re
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
@@ -34,178 +38,324 @@ except ImportError:
         return content
 
 
+# Stylesheet shared by all formatters; emitted once per kernel (see _load_custom_css)
+_TATTY_CSS = """
+<style>
+.tatty-agent-output {
+    font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
+    border: 1px solid #e1e4e8;
+    border-radius: 6px;
+    margin: 10px 0;
+}
+
+.tatty-agent-header {
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 8px 12px;
+    border-radius: 6px 6px 0 0;
+    font-weight: bold;
+    font-size: 14px;
+    display: flex;
+    align-items: center;
+    justify-content: space-between;
+}
+
+.tatty-agent-body {
+    padding: 12px;
+    background: #f8f9fa;
+}
+
+.tatty-tool-execution {
+    border-left: 4px solid #28a745;
+    padding-left: 12px;
+    margin: 8px 0;
+    background: #f8fff9;
+    border-radius: 4px;
+}
+
+.tatty-tool-name {
+    font-weight: bold;
+    color: #28a745;
+    font-size: 13px;
+}
+
+.tatty-tool-params {
+    color: #6c757d;
+    font-size: 12px;
+    margin: 4px 0;
+}
+
+.tatty-tool-result {
+    background: white;
+    border: 1px solid #e9ecef;
+    border-radius: 4px;
+    padding: 8px;
+    margin-top: 6px;
+    white-space: pre-wrap;
+    font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
+    font-size: 12px;
+    max-height: 300px;
+    overflow-y: auto;
+}
+
+.tatty-conversation-entry {
+    margin: 10px 0;
+    border-radius: 8px;
+    overflow: hidden;
+}
+
+.tatty-user-message {
+    background: #e3f2fd;
+    border-left: 4px solid #2196f3;
+}
+
+.tatty-agent-message {
+    background: #f3e5f5;
+    border-left: 4px solid #9c27b0;
+}
+
+.tatty-message-header {
+    padding: 8px 12px;
+    background: rgba(0,0,0,0.05);
+    font-weight: bold;
+    font-size: 13px;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+
+.tatty-message-body {
+    padding: 12px;
+}
+
+.tatty-timestamp {
+    color: #6c757d;
+    font-size: 11px;
+    font-weight: normal;
+}
+
+.tatty-expandable {
+    cursor: pointer;
+    user-select: none;
+}
+
+.tatty-expandable:hover {
+    background: rgba(0,0,0,0.05);
+}
+
+.tatty-collapsed {
+    display: none;
+}
+
+.tatty-progress-bar {
+    width: 100%;
+    height: 4px;
+    background: #e9ecef;
+    border-radius: 2px;
+    overflow: hidden;
+    margin: 8px 0;
+}
+
+.tatty-progress-fill {
+    height: 100%;
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+    animation: progress-pulse 2s ease-in-out infinite;
+}
+
+@keyframes progress-pulse {
+    0%, 100% { opacity: 0.6; }
+    50% { opacity: 1; }
+}
+
+.tatty-code-block {
+    background: #2d3748;
+    color: #e2e8f0;
+    padding: 12px;
+    border-radius: 4px;
+    overflow-x: auto;
+    font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
+    font-size: 12px;
+}
+
+.tatty-artifact-link {
+    display: inline-flex;
+    align-items: center;
+    padding: 4px 8px;
+    background: #fff3cd;
+    border: 1px solid #ffeaa7;
+    border-radius: 4px;
+    color: #856404;
+    text-decoration: none;
+    font-size: 12px;
+    margin: 2px;
+}
+
+.tatty-artifact-link:hover {
+    background: #ffeaa7;
+    text-decoration: none;
+}
+</style>
+"""
+
+_CSS_INJECTED = False
+
+# HTML templates rendered with str.format_map
+_AGENT_RESPONSE_TMPL = """
+<div class="tatty-agent-output">
+    <div class="tatty-agent-header">
+        <span>🤖 TATty Agent Response</span>
+        <span class="tatty-timestamp">{header_stats}</span>
+    </div>
+    <div class="tatty-agent-body">
+        <div class="tatty-conversation-entry tatty-user-message">
+            <div class="tatty-message-header">
+                <span>👤 Your Query</span>
+            </div>
+            <div class="tatty-message-body">
+                {query_html}
+            </div>
+        </div>
+
+        {tools_html}
+
+        <div class="tatty-conversation-entry tatty-agent-message">
+            <div class="tatty-message-header">
+                <span>🤖 Agent Response</span>
+            </div>
+            <div class="tatty-message-body">
+                {result_html}
+            </div>
+        </div>
+    </div>
+</div>
+"""
+
+_TOOL_EXEC_TMPL = """
+<div class="tatty-tool-execution">
+    <div class="tatty-tool-name">🛠️ {title}</div>
+    {params_block}
+    <div class="tatty-expandable" onclick="
+        var result = document.getElementById('{tool_id}');
+        var isHidden = result.style.display === 'none';
+        result.style.display = isHidden ? 'block' : 'none';
+        this.innerHTML = isHidden ? '📋 Result (click to hide)' : '📋 Result (click to show)';
+    ">📋 Result (click to show)</div>
+    <div id="{tool_id}" class="tatty-tool-result" style="display: none;">
+        {result_html}
+    </div>
+</div>
+"""
+
+_TOOL_PARAMS_TMPL = '<div class="tatty-tool-params">{}</div>'
+
+_PROGRESS_TMPL = """
+<div class="tatty-agent-output">
+    <div class="tatty-agent-header">
+        <span>⏳ {message}</span>
+    </div>
+    <div class="tatty-agent-body">
+        {progress_html}
+        <div style="text-align: center; color: #6c757d; font-size: 12px;">
+            Processing your request...
+        </div>
+    </div>
+</div>
+"""
+
+_PROGRESS_BAR_HTML = """
+<div class="tatty-progress-bar">
+    <div class="tatty-progress-fill" style="width: 100%;"></div>
+</div>
+"""
+
+_HISTORY_ENTRY_TMPL = """
+<div class="tatty-conversation-entry {css_class}">
+    <div class="tatty-message-header tatty-expandable" onclick="
+        var content = document.getElementById('{entry_id}');
+        var isHidden = content.style.display === 'none';
+        content.style.display = isHidden ? 'block' : 'none';
+        this.querySelector('.expand-icon').innerHTML = isHidden ? '🔽' : '▶️';
+    ">
+        <span><span class="expand-icon">▶️</span> {icon} {title}</span>
+        <span class="tatty-timestamp">{timestamp}</span>
+    </div>
+    <div id="{entry_id}" class="tatty-message-body" style="display: none;">
+        {content_html}
+    </div>
+    <div class="tatty-message-body" style="color: #6c757d; font-size: 12px;">
+        {preview_html}
+    </div>
+</div>
+"""
+
+_HISTORY_TMPL = """
+<div class="tatty-agent-output">
+    <div class="tatty-agent-header">
+        <span>📚 Conversation History ({count} entries)</span>
+    </div>
+    <div class="tatty-agent-body">
+        {entries_html}
+    </div>
+</div>
+"""
+
+# History entry type -> (icon, title, css class)
+_HISTORY_ENTRY_STYLES = {
+    "user_query": ("👤", "Your Query", "tatty-user-message"),
+    "agent_result": ("🤖", "Agent Response", "tatty-agent-message"),
+}
+
+# DOM ids for collapsible sections. The random prefix keeps ids unique against
+# outputs saved from earlier kernel sessions in the same notebook.
+_DOM_ID_PREFIX = os.urandom(4).hex()
+_dom_id_counter = itertools.count()
+
+
+def _next_dom_id(kind: str) -> str:
+    """Get a unique DOM id without hashing the displayed content"""
+    return f"{kind}_{_DOM_ID_PREFIX}_{next(_dom_id_counter)}"
+
+
+# File extension -> artifact link icon
+_FILE_ICONS = {
+    **dict.fromkeys(('.py', '.ipynb'), "🐍"),
+    **dict.fromkeys(('.js', '.ts', '.jsx', '.tsx'), "📜"),
+    **dict.fromkeys(('.html', '.htm'), "🌐"),
+    **dict.fromkeys(('.css', '.scss', '.sass'), "🎨"),
+    **dict.fromkeys(('.png', '.jpg', '.jpeg', '.gif', '.svg'), "🖼️"),
+    **dict.fromkeys(('.pdf', '.doc', '.docx'), "📄"),
+    **dict.fromkeys(('.csv', '.xlsx', '.xls'), "📊"),
+    **dict.fromkeys(('.md', '.markdown'), "📝"),
+}
+
+# A ``` fenced block: optional language line, then code up to the closing fence
+# (or the end of the content when the fence is never closed)
+_CODE_FENCE_RE = re.compile(r"```((?:(?!```)[^\n])*)(?:\n(.*?))?(?:```|\Z)", re.S)
+
+# Single-pass replacement table for _escape_html
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+
 class TattyDisplayFormatter:
     """Rich display formatter for TATty Agent results in Jupyter"""
 
     def __init__(self, theme: str = "default"):
         self.theme = theme
-        self._custom_css_loaded = False
 
     def _load_custom_css(self):
         """Load custom CSS for TATty Agent displays"""
-        if not JUPYTER_AVAILABLE or self._custom_css_loaded:
+        global _CSS_INJECTED
+        if _CSS_INJECTED or not JUPYTER_AVAILABLE:
             return
 
-        css = """
-        <style>
-        .tatty-agent-output {
-            font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
-            border: 1px solid #e1e4e8;
-            border-radius: 6px;
-            margin: 10px 0;
-        }
-
-        .tatty-agent-header {
-            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 8px 12px;
-            border-radius: 6px 6px 0 0;
-            font-weight: bold;
-            font-size: 14px;
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-        }
-
-        .tatty-agent-body {
-            padding: 12px;
-            background: #f8f9fa;
-        }
-
-        .tatty-tool-execution {
-            border-left: 4px solid #28a745;
-            padding-left: 12px;
-            margin: 8px 0;
-            background: #f8fff9;
-            border-radius: 4px;
-        }
-
-        .tatty-tool-name {
-            font-weight: bold;
-            color: #28a745;
-            font-size: 13px;
-        }
-
-        .tatty-tool-params {
-            color: #6c757d;
-            font-size: 12px;
-            margin: 4px 0;
-        }
-
-        .tatty-tool-result {
-            background: white;
-            border: 1px solid #e9ecef;
-            border-radius: 4px;
-            padding: 8px;
-            margin-top: 6px;
-            white-space: pre-wrap;
-            font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
-            font-size: 12px;
-            max-height: 300px;
-            overflow-y: auto;
-        }
-
-        .tatty-conversation-entry {
-            margin: 10px 0;
-            border-radius: 8px;
-            overflow: hidden;
-        }
-
-        .tatty-user-message {
-            background: #e3f2fd;
-            border-left: 4px solid #2196f3;
-        }
-
-        .tatty-agent-message {
-            background: #f3e5f5;
-            border-left: 4px solid #9c27b0;
-        }
-
-        .tatty-message-header {
-            padding: 8px 12px;
-            background: rgba(0,0,0,0.05);
-            font-weight: bold;
-            font-size: 13px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-
-        .tatty-message-body {
-            padding: 12px;
-        }
-
-        .tatty-timestamp {
-            color: #6c757d;
-            font-size: 11px;
-            font-weight: normal;
-        }
-
-        .tatty-expandable {
-            cursor: pointer;
-            user-select: none;
-        }
-
-        .tatty-expandable:hover {
-            background: rgba(0,0,0,0.05);
-        }
-
-        .tatty-collapsed {
-            display: none;
-        }
-
-        .tatty-progress-bar {
-            width: 100%;
-            height: 4px;
-            background: #e9ecef;
-            border-radius: 2px;
-            overflow: hidden;
-            margin: 8px 0;
-        }
-
-        .tatty-progress-fill {
-            height: 100%;
-            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-            animation: progress-pulse 2s ease-in-out infinite;
-        }
-
-        @keyframes progress-pulse {
-            0%, 100% { opacity: 0.6; }
-            50% { opacity: 1; }
-        }
-
-        .tatty-code-block {
-            background: #2d3748;
-            color: #e2e8f0;
-            padding: 12px;
-            border-radius: 4px;
-            overflow-x: auto;
-            font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
-            font-size: 12px;
-        }
-
-        .tatty-artifact-link {
-            display: inline-flex;
-            align-items: center;
-            padding: 4px 8px;
-            background: #fff3cd;
-            border: 1px solid #ffeaa7;
-            border-radius: 4px;
-            color: #856404;
-            text-decoration: none;
-            font-size: 12px;
-            margin: 2px;
-        }
-
-        .tatty-artifact-link:hover {
-            background: #ffeaa7;
-            text-decoration: none;
-        }
-        </style>
-        """
-
-        display(HTML(css))
-        self._custom_css_loaded = True
+        display(HTML(_TATTY_CSS))
+        _CSS_INJECTED = True
 
     def display_agent_response(
         self,
@@ -230,44 +380,21 @@ class TattyDisplayFormatter:
         else:
             header_stats = f"{timestamp} • {execution_time:.1f}s"
 
-        html_content = f"""
-        <div class="tatty-agent-output">
-            <div class="tatty-agent-header">
-                <span>🤖 TATty Agent Response</span>
-                <span class="tatty-timestamp">{header_stats}</span>
-            </div>
-            <div class="tatty-agent-body">
-                <div class="tatty-conversation-entry tatty-user-message">
-                    <div class="tatty-message-header">
-                        <span>👤 Your Query</span>
-                    </div>
-                    <div class="tatty-message-body">
-                        {self._escape_html(query)}
-                    </div>
-                </div>
-
-                {self._format_tool_executions(tools_used)}
-
-                <div class="tatty-conversation-entry tatty-agent-message">
-                    <div class="tatty-message-header">
-                        <span>🤖 Agent Response</span>
-                    </div>
-                    <div class="tatty-message-body">
-                        {self._format_result_content(result)}
-                    </div>
-                </div>
-            </div>
-        </div>
-        """
-
-        display(HTML(html_content))
+        html_content = _AGENT_RESPONSE_TMPL.format_map({
+            "header_stats": header_stats,
+            "query_html": self._escape_html(query),
+            "tools_html": self._format_tool_executions(tools_used),
+            "result_html": self._format_result_content(result),
+        })
 
-        # Display observability data for copy-paste if available
+        # Observability data for copy-paste if available, raw text otherwise
+        # (backward compatible); sent with the response in a single display call
         if observability_data:
-            self._display_observability_toggle(observability_data)
+            html_content += self._build_observability_toggle(observability_data)
         else:
-            # Fallback to raw text for backward compatibility
-            self._display_raw_text_toggle(result)
+            html_content += self._build_raw_text_toggle(result)
+
+        display(HTML(html_content))
 
     def display_tool_execution(
         self,
@@ -279,28 +406,19 @@ class TattyDisplayFormatter:
         """Display individual tool execution with collapsible result"""
         self._load_custom_css()
 
-        tool_id = f"tool_{abs(hash(f'{tool_name}{str(params)}'))}"
+        tool_id = _next_dom_id("tool")
         time_str = f" • {execution_time:.2f}s" if execution_time else ""
 
         params_str = ", ".join([f"{k}={v}" for k, v in params.items() if v is not None])
         if len(params_str) > 100:
             params_str = params_str[:97] + "..."
 
-        html_content = f"""
-        <div class="tatty-tool-execution">
-            <div class="tatty-tool-name">🛠️ {tool_name}{time_str}</div>
-            {f'<div class="tatty-tool-params">{self._escape_html(params_str)}</div>' if params_str else ''}
-            <div class="tatty-expandable" onclick="
-                var result = document.getElementById('{tool_id}');
-                var isHidden = result.style.display === 'none';
-                result.style.display = isHidden ? 'block' : 'none';
-                this.innerHTML = isHidden ? '📋 Result (click to hide)' : '📋 Result (click to show)';
-            ">📋 Result (click to show)</div>
-            <div id="{tool_id}" class="tatty-tool-result" style="display: none;">
-                {self._escape_html(result)}
-            </div>
-        </div>
-        """
+        html_content = _TOOL_EXEC_TMPL.format_map({
+            "title": f"{tool_name}{time_str}",
+            "params_block": _TOOL_PARAMS_TMPL.format(self._escape_html(params_str)) if params_str else "",
+            "tool_id": tool_id,
+            "result_html": self._escape_html(result),
+        })
 
         display(HTML(html_content))
 
@@ -308,29 +426,14 @@ class TattyDisplayFormatter:
         """Display a progress indicator for ongoing operations"""
         self._load_custom_css()
 
-        progress_html = """
-        <div class="tatty-progress-bar">
-            <div class="tatty-progress-fill" style="width: 100%;"></div>
-        </div>
-        """ if show_bar else ""
-
-        html_content = f"""
-        <div class="tatty-agent-output">
-            <div class="tatty-agent-header">
-                <span>⏳ {message}</span>
-            </div>
-            <div class="tatty-agent-body">
-                {progress_html}
-                <div style="text-align: center; color: #6c757d; font-size: 12px;">
-                    Processing your request...
-                </div>
-            </div>
-        </div>
-        """
+        html_content = _PROGRESS_TMPL.format_map({
+            "message": message,
+            "progress_html": _PROGRESS_BAR_HTML if show_bar else "",
+        })
 
         display(HTML(html_content))
 
-    def display_conversation_history(self, history: List[Dict[str, Any]]):
+    def display_conversation_history(self, history: Sequence[Dict[str, Any]]):
         """Display conversation history in an expandable format"""
         self._load_custom_css()
 
@@ -338,58 +441,36 @@ class TattyDisplayFormatter:
             display(HTML('<div style="color: #6c757d; text-align: center;">No conversation history</div>'))
             return
 
-        entries_html = ""
+        entry_parts = []
         for i, entry in enumerate(history):
             entry_type = entry.get("type", "unknown")
             content = entry.get("content", "")
             timestamp = entry.get("timestamp", "")
 
-            if entry_type == "user_query":
-                icon = "👤"
-                title = "Your Query"
-                css_class = "tatty-user-message"
-            elif entry_type == "agent_result":
-                icon = "🤖"
-                title = "Agent Response"
-                css_class = "tatty-agent-message"
+            style = _HISTORY_ENTRY_STYLES.get(entry_type)
+            if style is not None:
+                icon, title, css_class = style
             else:
                 icon = "⚠️"
                 title = entry_type.replace("_", " ").title()
                 css_class = "tatty-agent-message"
 
-            entry_id = f"history_{i}"
             short_content = content[:100] + "..." if len(content) > 100 else content
 
-            entries_html += f"""
-            <div class="tatty-conversation-entry {css_class}">
-                <div class="tatty-message-header tatty-expandable" onclick="
-                    var content = document.getElementById('{entry_id}');
-                    var isHidden = content.style.display === 'none';
-                    content.style.display = isHidden ? 'block' : 'none';
-                    this.querySelector('.expand-icon').innerHTML = isHidden ? '🔽' : '▶️';
-                ">
-                    <span><span class="expand-icon">▶️</span> {icon} {title}</span>
-                    <span class="tatty-timestamp">{timestamp}</span>
-                </div>
-                <div id="{entry_id}" class="tatty-message-body" style="display: none;">
-                    {self._format_result_content(content)}
-                </div>
-                <div class="tatty-message-body" style="color: #6c757d; font-size: 12px;">
-                    {self._escape_html(short_content)}
-                </div>
-            </div>
-            """
-
-        html_content = f"""
-        <div class="tatty-agent-output">
-            <div class="tatty-agent-header">
-                <span>📚 Conversation History ({len(history)} entries)</span>
-            </div>
-            <div class="tatty-agent-body">
-                {entries_html}
-            </div>
-        </div>
-        """
+            entry_parts.append(_HISTORY_ENTRY_TMPL.format_map({
+                "css_class": css_class,
+                "entry_id": f"history_{i}",
+                "icon": icon,
+                "title": title,
+                "timestamp": timestamp,
+                "content_html": self._format_result_content(content),
+                "preview_html": self._escape_html(short_content),
+            }))
+
+        html_content = _HISTORY_TMPL.format_map({
+            "count": len(history),
+            "entries_html": "".join(entry_parts),
+        })
 
         display(HTML(html_content))
 
@@ -400,17 +481,19 @@ class TattyDisplayFormatter:
 
         self._load_custom_css()
 
-        links_html = ""
+        link_parts = []
         for artifact in artifacts:
             name = artifact.get("name", "Unknown")
             path = artifact.get("path", "")
             type_icon = self._get_file_icon(path)
 
-            links_html += f"""
+            link_parts.append(f"""
             <a href="files/{path}" class="tatty-artifact-link" target="_blank">
                 {type_icon} {name}
             </a>
-            """
+            """)
+
+        links_html = "".join(link_parts)
 
         html_content = f"""
         <div style="margin: 10px 0;">
@@ -426,59 +509,55 @@ class TattyDisplayFormatter:
         if not tools_used:
             return ""
 
-        tools_html = ""
+        tool_parts = []
         for tool in tools_used:
             name = tool.get("name", "Unknown")
             params = tool.get("params", {})
             result = tool.get("result", "")
             time_taken = tool.get("execution_time", 0)
 
-            tool_id = f"tool_result_{abs(hash(str(tool)))}"
+            tool_id = _next_dom_id("tool_result")
             params_str = ", ".join([f"{k}={v}" for k, v in params.items() if v is not None])
 
-            tools_html += f"""
-            <div class="tatty-tool-execution">
-                <div class="tatty-tool-name">🛠️ {name} • {time_taken:.2f}s</div>
-                {f'<div class="tatty-tool-params">{self._escape_html(params_str)}</div>' if params_str else ''}
-                <div class="tatty-expandable" onclick="
-                    var result = document.getElementById('{tool_id}');
-                    var isHidden = result.style.display === 'none';
-                    result.style.display = isHidden ? 'block' : 'none';
-                    this.innerHTML = isHidden ? '📋 Result (click to hide)' : '📋 Result (click to show)';
-                ">📋 Result (click to show)</div>
-                <div id="{tool_id}" class="tatty-tool-result" style="display: none;">
-                    {self._escape_html(result)}
-                </div>
-            </div>
-            """
+            tool_parts.append(_TOOL_EXEC_TMPL.format_map({
+                "title": f"{name} • {time_taken:.2f}s",
+                "params_block": _TOOL_PARAMS_TMPL.format(self._escape_html(params_str)) if params_str else "",
+                "tool_id": tool_id,
+                "result_html": self._escape_html(result),
+            }))
 
-        return tools_html
+        return "".join(tool_parts)
 
     def _format_result_content(self, content: str) -> str:
         """Format result content with syntax highlighting for code blocks"""
         # Simple markdown-style code block detection
-        if "```" in content:
-            parts = content.split("```")
-            formatted = ""
-            for i, part in enumerate(parts):
-                if i % 2 == 0:  # Regular text
-                    formatted += self._escape_html(part)
-                else:  # Code block
-                    lines = part.split('\n')
-                    language = lines[0] if lines else ""
-                    code = '\n'.join(lines[1:]) if len(lines) > 1 else part
-                    formatted += f'<div class="tatty-code-block">{self._escape_html(code)}</div>'
-            return formatted
-        else:
+        if "```" not in content:
             return self._escape_html(content).replace('\n', '<br>')
 
+        pieces = []
+        last = 0
+        for match in _CODE_FENCE_RE.finditer(content):
+            pieces.append(self._escape_html(content[last:match.start()]))  # Regular text
+            # The first line after the fence is the language unless it is the whole block
+            first_line, body = match.groups()
+            code = first_line if body is None else body
+            pieces.append(f'<div class="tatty-code-block">{self._escape_html(code)}</div>')
+            last = match.end()
+        pieces.append(self._escape_html(content[last:]))
+        return "".join(pieces)
+
     def _display_observability_toggle(self, observability_data: Dict[str, Any]):
         """Display observability JSON with improved styling and copy functionality"""
+        display(HTML(self._build_observability_toggle(observability_data)))
+
+    def _build_observability_toggle(self, observability_data: Dict[str, Any]) -> str:
+        """Build the observability JSON toggle HTML"""
         import json
 
         obs_json = json.dumps(observability_data, indent=2, default=str)
-        obs_id = f"obs_data_{abs(hash(obs_json))}"
-        copy_id = f"copy_btn_{abs(hash(obs_json))}"
+        obs_suffix = _next_dom_id("obs")
+        obs_id = f"obs_data_{obs_suffix}"
+        copy_id = f"copy_btn_{obs_suffix}"
 
         # Extract key metrics for display
         total_duration = observability_data.get('total_duration', 0)
@@ -486,7 +565,7 @@ class TattyDisplayFormatter:
         total_tokens_out = observability_data.get('total_tokens', {}).get('output', 0)
         steps_count = len(observability_data.get('steps', []))
 
-        html_content = f"""
+        return f"""
         <div style="margin-top: 10px;">
             <div style="display: flex; gap: 8px; align-items: center;">
                 <button onclick="
@@ -506,7 +585,7 @@ class TattyDisplayFormatter:
                     flex: 1;
                 ">📊 Show Observability JSON (1 task: {steps_count} steps, {total_tokens_in + total_tokens_out:.0f} tokens, {total_duration:.1f}s)</button>
 
-                <button id="{copy_id}" onclick="copyObservabilityData_{abs(hash(obs_json))}()" style="
+                <button id="{copy_id}" onclick="copyObservabilityData_{obs_suffix}()" style="
                     background: #f5f5f5;
                     border: 1px solid #ddd;
                     padding: 6px 12px;
@@ -537,7 +616,7 @@ class TattyDisplayFormatter:
         </div>
 
         <script>
-            function copyObservabilityData_{abs(hash(obs_json))}() {{
+            function copyObservabilityData_{obs_suffix}() {{
                 var jsonData = {repr(obs_json)};
                 navigator.clipboard.writeText(jsonData).then(() => {{
                     var btn = document.getElementById('{copy_id}');
@@ -559,13 +638,11 @@ class TattyDisplayFormatter:
         </script>
         """
 
-        display(HTML(html_content))
-
-    def _display_raw_text_toggle(self, text: str):
-        """Display a collapsible raw text section for copy-paste"""
-        text_id = f"raw_text_{abs(hash(text))}"
+    def _build_raw_text_toggle(self, text: str) -> str:
+        """Build a collapsible raw text section for copy-paste"""
+        text_id = _next_dom_id("raw_text")
 
-        html_content = f"""
+        return f"""
         <div style="margin-top: 10px;">
             <button onclick="
                 var textDiv = document.getElementById('{text_id}');
@@ -596,8 +673,6 @@ class TattyDisplayFormatter:
         </div>
         """
 
-        display(HTML(html_content))
-
     def _syntax_highlight_json(self, json_text: str) -> str:
         """Apply basic syntax highlighting to JSON text"""
         import re
@@ -623,33 +698,14 @@ class TattyDisplayFormatter:
 
     def _escape_html(self, text: str) -> str:
         """Escape HTML special characters"""
-        return (text.replace("&", "&amp;")
-                   .replace("<", "&lt;")
-                   .replace(">", "&gt;")
-                   .replace('"', "&quot;")
-                   .replace("'", "&#x27;"))
+        # Plain prose is common; a few substring scans beat a full translate pass
+        if not any(c in text for c in "&<>\"'"):
+            return text
+        return text.translate(_HTML_ESCAPE_TABLE)
 
     def _get_file_icon(self, path: str) -> str:
         """Get appropriate icon for file type"""
-        path_lower = path.lower()
-        if path_lower.endswith(('.py', '.ipynb')):
-            return "🐍"
-        elif path_lower.endswith(('.js', '.ts', '.jsx', '.tsx')):
-            return "📜"
-        elif path_lower.endswith(('.html', '.htm')):
-            return "🌐"
-        elif path_lower.endswith(('.css', '.scss', '.sass')):
-            return "🎨"
-        elif path_lower.endswith(('.png', '.jpg', '.jpeg', '.gif', '.svg')):
-            return "🖼️"
-        elif path_lower.endswith(('.pdf', '.doc', '.docx')):
-            return "📄"
-        elif path_lower.endswith(('.csv', '.xlsx', '.xls')):
-            return "📊"
-        elif path_lower.endswith(('.md', '.markdown')):
-            return "📝"
-        else:
-            return "📁"
+        return _FILE_ICONS.get(os.path.splitext(path)[1].lower(), "📁")
 
 
 # Global formatter instance
@@ -668,7 +724,7 @@ def display_progress_indicator(message: str = "Agent thinking...", show_bar: boo
     """Display a progress indicator"""
     _default_formatter.display_progress_indicator(message, show_bar)
 
-def display_conversation_history(history: List[Dict[str, Any]]):
+def display_conversation_history(history: Sequence[Dict[str, Any]]):
     """Display conversation history"""
     _default_formatter.display_conversation_history(history)
 
@@ -12,6 +12,7 @@ Usage:
 """
 import asyncio
 import time
+from collections import deque
 from typing import Any, Dict, List, Optional, Union
 
 try:
@@ -73,6 +74,13 @@ from .display import display_agent_response, display_progress_indicator, display
 from .notebook import NotebookContextManager
 
 
+# Query/result entries kept for %tatty_history; older entries are dropped
+MAX_EXECUTION_HISTORY = 500
+
+# Notebook variable names listed in the per-query context message
+MAX_CONTEXT_VARIABLES = 20
+
+
 class ErrorHandlingConfig:
     """Configuration for enhanced error handling behavior"""
 
@@ -103,7 +111,7 @@ class TattyMagics(Magics):
         self.tatty_config = load_config()  # Use different name to avoid conflict with IPython's config
         self.notebook_context = NotebookContextManager(shell) if shell else None
         self._current_runtime: Optional[AgentRuntime] = None
-        self._execution_history: List[Dict[str, Any]] = []
+        self._execution_history: deque[Dict[str, Any]] = deque(maxlen=MAX_EXECUTION_HISTORY)
         self._observability_session: List[Dict[str, Any]] = []  # Session-level observability tracking
 
         # Enhanced error handling configuration
@@ -208,7 +216,7 @@ class TattyMagics(Magics):
             return
 
         # Set up working directory
-        working_dir = args.dir or self.tatty_config.working_dir
+        working_dir = args.dir or self.tatty_config.resolved_working_dir
 
         # Execute the agent
         return self._run_agent_query(
@@ -279,9 +287,9 @@ class TattyMagics(Magics):
 
             # Add current notebook variables (fresh each time, don't accumulate)
             if self.notebook_context and not fresh:
-                notebook_vars = self.notebook_context.get_notebook_variables(refresh=True)
-                if notebook_vars:
-                    vars_info = f"Available notebook variables: {', '.join(notebook_vars.keys())}"
+                var_names = list(self.notebook_context.iter_variable_names(MAX_CONTEXT_VARIABLES))
+                if var_names:
+                    vars_info = f"Available notebook variables: {', '.join(var_names)}"
                     state.messages.append(Message(
                         role="assistant",
                         message=f"Context: {vars_info}"
@@ -432,12 +440,12 @@ class TattyMagics(Magics):
         print(f"🔧 Code Generation Mode: Generating executable Python code...")
 
         # Call AgentDispatcher for code generation
-        response = asyncio.run(b.AgentDispatcher(
+        response = await b.AgentDispatcher(
             user_query=query,
             intent=intent_result,
             state=state.messages,
             working_dir=working_dir
-        ))
+        )
 
         dispatcher_time = time.time() - start_time
         end_time_iso = datetime.now(timezone.utc).isoformat()
@@ -501,7 +509,7 @@ class TattyMagics(Magics):
                 "execution_time": 0.01
             })
             # Fall back to full agent loop which can use tools
-            result, response_obj, loop_steps = asyncio.run(self._run_full_agent_loop(query, state, working_dir, verbose))
+            result, response_obj, loop_steps = await self._run_full_agent_loop(query, state, working_dir, verbose)
             steps.extend(loop_steps or [])
             return result, response_obj, steps
         else:
@@ -515,7 +523,7 @@ class TattyMagics(Magics):
                 "execution_time": 0.01
             })
             # Fall back to full agent loop to show tool execution process
-            result, response_obj, loop_steps = asyncio.run(self._run_full_agent_loop(query, state, working_dir, verbose))
+            result, response_obj, loop_steps = await self._run_full_agent_loop(query, state, working_dir, verbose)
             steps.extend(loop_steps or [])
             return result, response_obj, steps
 
@@ -529,12 +537,12 @@ class TattyMagics(Magics):
         start_time = time.time()
 
         # Call AgentDispatcher for text response
-        response = asyncio.run(b.AgentDispatcher(
+        response = await b.AgentDispatcher(
             user_query=query,
             intent=intent_result,
             state=state.messages,
             working_dir=working_dir
-        ))
+        )
 
         dispatcher_time = time.time() - start_time
 
@@ -572,7 +580,7 @@ class TattyMagics(Magics):
                 "execution_time": 0.01
             })
             # Fall back to tool execution
-            result, response_obj = asyncio.run(self._execute_agent_tools(response, state, working_dir, verbose))
+            result, response_obj = await self._execute_agent_tools(response, state, working_dir, verbose)
             return result, response_obj, steps
 
     async def _handle_tool_execution(self, query: str, intent_result, state: AgentState, working_dir: str, max_iterations: int, verbose: bool, observability: dict):
@@ -593,7 +601,7 @@ class TattyMagics(Magics):
         })
 
         # Run the agent loop
-        result = asyncio.run(runtime.run_loop(query, max_iterations))
+        result = await runtime.run_loop(query, max_iterations)
 
         # Get the last response object if available
         response_obj = getattr(state, 'last_response', None)
@@ -629,7 +637,7 @@ class TattyMagics(Magics):
         from ..tools.registry import execute_tool
 
         try:
-            result = asyncio.run(execute_tool(response, working_dir))
+            result = await execute_tool(response, working_dir)
             if verbose:
                 print(f"✅ Executed tool: {response.action}")
             return result, response
@@ -660,7 +668,7 @@ class TattyMagics(Magics):
         runtime = AgentRuntime(state, callbacks)
 
         # Run the agent loop
-        result = asyncio.run(runtime.run_loop(query, max_iterations=10))
+        result = await runtime.run_loop(query, max_iterations=10)
 
         # Get the last response object if available
         response_obj = getattr(state, 'last_response', None)
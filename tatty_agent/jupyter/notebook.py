@@ -5,7 +5,9 @@ This module provides access to notebook variables, dataframes, and the ability
 to generate and modify cells programmatically.
 """
 import inspect
+import itertools
 import json
+from collections.abc import Iterator
 from typing import Any, Dict, List, Optional, Union, Callable
 from datetime import datetime
 import sys
@@ -68,13 +70,7 @@ class NotebookContextManager:
         user_ns = self.shell.user_ns
 
         for name, value in user_ns.items():
-            # Skip private variables and builtins
-            if name.startswith('_') or name in ['In', 'Out', 'get_ipython', 'exit', 'quit']:
-                continue
-
-            # Skip modules and functions (unless they're user-defined)
-            if inspect.ismodule(value) or (inspect.isfunction(value) and
-                                         getattr(value, '__module__', None) != '__main__'):
+            if not self._is_user_variable(name, value):
                 continue
 
             var_info = self._analyze_variable(name, value)
@@ -85,6 +81,37 @@ class NotebookContextManager:
         self._last_cache_time = now
         return variables
 
+    def iter_variable_names(self, limit: int | None = None) -> Iterator[str]:
+        """
+        Yield names of user variables in the notebook namespace
+
+        Unlike get_notebook_variables, values are never analyzed, so large
+        objects are not touched.
+
+        Args:
+            limit: Stop after this many names (None for all)
+        """
+        if not self.shell:
+            return iter(())
+
+        names = (name for name, value in list(self.shell.user_ns.items())
+                 if self._is_user_variable(name, value))
+        return itertools.islice(names, limit)
+
+    @staticmethod
+    def _is_user_variable(name: str, value: Any) -> bool:
+        """Whether a namespace entry is a user variable worth reporting"""
+        # Skip private variables and builtins
+        if name.startswith('_') or name in ('In', 'Out', 'get_ipython', 'exit', 'quit'):
+            return False
+
+        # Skip modules and functions (unless they're user-defined)
+        if inspect.ismodule(value) or (inspect.isfunction(value) and
+                                     getattr(value, '__module__', None) != '__main__'):
+            return False
+
+        return True
+
     def get_variable_by_name(self, name: str) -> Any:
         """Get a specific variable by name"""
         if not self.shell:
@@ -4,21 +4,25 @@ Live tool execution display with progress indicators for Jupyter notebooks
 This module provides real-time progress bars, status indicators, and
 collapsible output sections for tool execution in notebooks.
 """
-import asyncio
+import html
+import importlib.util
+import itertools
+import os
 import time
 import threading
-from typing import Any, Dict, List, Optional, Callable, Union
+from collections import deque
+from string import Template
+from typing import Any, Deque, Dict, List, Optional, Callable, Tuple, Union
 from datetime import datetime
 from contextlib import contextmanager
+from functools import cache, lru_cache
 
 try:
     from IPython.display import display, HTML, clear_output, update_display
     from IPython.core.display import DisplayObject
-    import ipywidgets as widgets
     JUPYTER_AVAILABLE = True
 except ImportError:
     JUPYTER_AVAILABLE = False
-    widgets = None
 
     def display(*args, **kwargs):
         pass
@@ -29,18 +33,237 @@ except ImportError:
     def update_display(*args, **kwargs):
         pass
 
+# ipywidgets is optional: without it the tracker falls back to HTML panels.
+# Its import chain is slow, so it is only loaded the first time a widget is built.
+try:
+    WIDGETS_AVAILABLE = importlib.util.find_spec("ipywidgets") is not None
+except (ImportError, ValueError):
+    WIDGETS_AVAILABLE = False
+
+
+@cache
+def _load_widgets():
+    """Import ipywidgets on first use"""
+    import ipywidgets
+    return ipywidgets
+
+
+# Pulse animation shared by every HTML progress panel; emitted once per kernel
+_PULSE_STYLE = """
+<style>
+@keyframes pulse {
+    0%, 100% { opacity: 0.6; }
+    50% { opacity: 1; }
+}
+</style>
+"""
+_STYLES_INJECTED = False
+
+# HTML panel templates rendered with string.Template
+_INITIAL_TEMPLATE = Template("""
+<div id="$did" style="
+    border: 1px solid #e1e4e8;
+    border-radius: 6px;
+    margin: 10px 0;
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
+">
+    <div style="
+        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 8px 12px;
+        border-radius: 6px 6px 0 0;
+        font-weight: bold;
+        font-size: 14px;
+        display: flex;
+        align-items: center;
+        justify-content: space-between;
+    ">
+        <span>🛠️ Executing $tool_name</span>
+        <button onclick="
+            // Signal interruption (would need backend integration)
+            this.innerHTML = '⏸️ Interrupted';
+            this.disabled = true;
+        " style="
+            background: rgba(255,255,255,0.2);
+            border: 1px solid rgba(255,255,255,0.3);
+            color: white;
+            padding: 2px 8px;
+            border-radius: 3px;
+            cursor: pointer;
+            font-size: 11px;
+        ">❌ Cancel</button>
+    </div>
+    <div style="padding: 12px; background: #f8f9fa;">
+        $param_block
+        <div style="
+            background: #e9ecef;
+            border-radius: 10px;
+            height: 6px;
+            overflow: hidden;
+            margin: 8px 0;
+        ">
+            <div style="
+                background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+                height: 100%;
+                width: $progress%;
+                transition: width 0.3s ease;
+                animation: pulse 2s ease-in-out infinite;
+            " id="${did}_bar"></div>
+        </div>
+        <div id="${did}_status" style="
+            color: #495057;
+            font-size: 12px;
+            text-align: center;
+        ">$status</div>
+    </div>
+</div>
+""")
+
+_PARAM_BLOCK_TEMPLATE = Template(
+    '<div style="color: #6c757d; font-size: 12px; margin-bottom: 8px;">$param_str</div>'
+)
+
+_COMPLETION_TEMPLATE = Template("""
+<div id="$did" style="
+    border: 1px solid $border;
+    border-radius: 6px;
+    margin: 10px 0;
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
+">
+    <div style="
+        background: $background;
+        color: $color;
+        padding: 8px 12px;
+        border-radius: 6px 6px 0 0;
+        font-weight: bold;
+        font-size: 14px;
+        display: flex;
+        align-items: center;
+        justify-content: space-between;
+    ">
+        <span>$status_icon $tool_name $status_text</span>
+        <span style="font-weight: normal; font-size: 12px;">${execution_time}s</span>
+    </div>
+    <div style="padding: 12px; background: #f8f9fa;">
+        <div style="
+            color: #6c757d;
+            font-size: 12px;
+            margin-bottom: 8px;
+        ">$result_preview</div>
+        <div style="text-align: center;">
+            <button onclick="
+                var resultDiv = document.getElementById('$result_id');
+                var isHidden = resultDiv.style.display === 'none';
+                resultDiv.style.display = isHidden ? 'block' : 'none';
+                this.innerHTML = isHidden ? '📋 Hide Full Result' : '📋 Show Full Result';
+            " style="
+                background: #007bff;
+                color: white;
+                border: none;
+                padding: 6px 12px;
+                border-radius: 4px;
+                cursor: pointer;
+                font-size: 12px;
+            ">📋 Show Full Result</button>
+        </div>
+        <div id="$result_id" style="
+            display: none;
+            background: white;
+            border: 1px solid #e9ecef;
+            border-radius: 4px;
+            padding: 12px;
+            margin-top: 8px;
+            max-height: 300px;
+            overflow-y: auto;
+            font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
+            font-size: 12px;
+            white-space: pre-wrap;
+        ">$result_html</div>
+    </div>
+</div>
+""")
+
+
+# Display ids: a per-kernel prefix keeps them unique against panels saved
+# in the notebook by earlier sessions, the counter within this one
+_DISPLAY_ID_PREFIX = os.urandom(4).hex()
+_display_id_counter = itertools.count()
+
+# Tool history keeps only a bounded prefix of each result
+_MAX_STORED_RESULT_CHARS = 4096
+
+# Single-pass HTML escaping
+# Results larger than this are escaped directly rather than cached
+_ESCAPE_CACHE_MAX_CHARS = 64 * 1024
+
+
+@lru_cache(maxsize=256)
+def _escape_cached(text: str) -> str:
+    """Escape HTML special characters, memoized for repeated tool results"""
+    return html.escape(text, quote=True)
+
+
+def _escape_text(text: str) -> str:
+    """Escape HTML special characters, caching only reasonably sized texts"""
+    if len(text) > _ESCAPE_CACHE_MAX_CHARS:
+        return html.escape(text, quote=True)
+    return _escape_cached(text)
+
+
+def _noop(*args, **kwargs):
+    """Stand-in emitter while no panel is shown"""
+    pass
+
+
+def _inject_styles():
+    """Emit the shared panel styles the first time a panel is shown"""
+    global _STYLES_INJECTED
+    if _STYLES_INJECTED:
+        return
+
+    display(HTML(_PULSE_STYLE))
+    _STYLES_INJECTED = True
+
 
 class ToolExecutionProgressTracker:
     """Tracks and displays tool execution progress in real-time"""
 
-    def __init__(self):
+    def __init__(self, max_history: int = 200):
         self.current_tool: Optional[str] = None
         self.current_progress: float = 0.0
         self.execution_start: Optional[float] = None
-        self.tool_history: List[Dict[str, Any]] = []
+        self.tool_history: Deque[Dict[str, Any]] = deque(maxlen=max_history)
         self._display_id: Optional[str] = None
         self._interrupt_requested: bool = False
         self._status_widgets: Dict[str, Any] = {}
+        self._panel_fields: Dict[str, Any] = {}
+        # (progress, status text) last sent to the HTML panel
+        self._last_rendered: Optional[Tuple[float, str]] = None
+
+        # Session totals, kept up to date as tools complete so they also
+        # cover entries the bounded history has already dropped
+        self._total_time: float = 0.0
+        self._success_count: int = 0
+        self._total_count: int = 0
+
+        # Debounced updates: update_progress only records the latest status and
+        # a background timer pushes it to the display at most once per interval
+        self._mininterval: float = 0.1
+        self._last_emit_ts: float = 0.0
+        self._pending_update: Optional[Tuple[float, Optional[str]]] = None
+        self._flush_timer: Optional[threading.Timer] = None
+        self._emit_lock = threading.Lock()
+
+        # Emitters bound per execution so the update path carries no
+        # availability checks
+        self._schedule_update: Callable[[], None] = _noop
+        self._emit_update: Callable[[Optional[str]], None] = _noop
+
+        # Trivial executions never get a panel: it is only shown once the tool
+        # has run past the delay or reported progress
+        self._show_delay: float = 0.05
+        self._pending_display: Optional[Tuple[str, Dict[str, Any]]] = None
+        self._show_timer: Optional[threading.Timer] = None
 
     def start_tool_execution(self, tool_name: str, params: Dict[str, Any] = None):
         """Start tracking a new tool execution"""
@@ -48,12 +271,50 @@ class ToolExecutionProgressTracker:
         self.current_progress = 0.0
         self.execution_start = time.time()
         self._interrupt_requested = False
+        self._last_emit_ts = 0.0
+        self._pending_update = None
+        self._schedule_update = self._schedule_flush if JUPYTER_AVAILABLE else _noop
+        self._emit_update = _noop
+
+        self._display_id = None
+
+        # Defer the initial display until the tool proves to be non-trivial
+        self._pending_display = (tool_name, params or {})
+        if JUPYTER_AVAILABLE:
+            timer = threading.Timer(self._show_delay, self._maybe_show)
+            timer.daemon = True
+            self._show_timer = timer
+            timer.start()
+
+    def _maybe_show(self):
+        """Show the deferred panel if the tool is still running"""
+        with self._emit_lock:
+            self._show_timer = None
+            self._show_pending_display()
+
+    def _show_pending_display(self):
+        """Display the deferred initial panel; caller holds _emit_lock"""
+        if self._pending_display is None:
+            return
+        tool_name, params = self._pending_display
+        self._pending_display = None
 
         # Create unique display ID
-        self._display_id = f"tool_progress_{abs(hash(f'{tool_name}_{time.time()}'))}"
+        self._display_id = f"tool_progress_{_DISPLAY_ID_PREFIX}_{next(_display_id_counter):x}"
 
         # Display initial progress
-        self._display_initial_progress(tool_name, params or {})
+        widgets = None
+        if WIDGETS_AVAILABLE and JUPYTER_AVAILABLE:
+            try:
+                widgets = _load_widgets()
+            except ImportError:
+                pass  # Installed but broken ipywidgets: use the HTML panel
+        if widgets is not None:
+            self._create_progress_widgets(widgets, tool_name, params)
+            self._emit_update = self._update_progress_widgets
+        else:
+            self._display_initial_progress(tool_name, params)
+            self._emit_update = self._update_progress_display
 
     def update_progress(self, progress: float, status: str = None):
         """Update the current tool's progress"""
@@ -62,8 +323,39 @@ class ToolExecutionProgressTracker:
 
         self.current_progress = min(100.0, max(0.0, progress))
 
-        # Update display
-        self._update_progress_display(status)
+        with self._emit_lock:
+            self._pending_update = (self.current_progress, status)
+
+            # A scheduled flush will pick up this update along with any that follow
+            if self._flush_timer is None:
+                self._schedule_update()
+
+    def _schedule_flush(self):
+        """Start a one-shot timer that emits the pending update; caller holds _emit_lock"""
+        delay = max(0.0, self._last_emit_ts + self._mininterval - time.monotonic())
+        # A timer thread rather than the event loop: in a notebook the loop is
+        # usually blocked by the very cell that is reporting progress
+        timer = threading.Timer(delay, self._flush)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def _flush(self):
+        """Emit the latest pending update, if the tool is still running"""
+        with self._emit_lock:
+            self._flush_timer = None
+            pending, self._pending_update = self._pending_update, None
+            if pending is None or not self.current_tool:
+                return
+
+            self._last_emit_ts = time.monotonic()
+            _, status = pending
+
+            # Progress was reported, so the tool is worth a panel
+            self._show_pending_display()
+
+            # Update display
+            self._emit_update(status)
 
     def complete_tool_execution(self, result: str, success: bool = True):
         """Complete the current tool execution"""
@@ -77,17 +369,38 @@ class ToolExecutionProgressTracker:
             "name": self.current_tool,
             "execution_time": execution_time,
             "success": success,
-            "result": result,
-            "timestamp": datetime.now().isoformat()
+            "result": result[:_MAX_STORED_RESULT_CHARS],
+            "timestamp": datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
         })
-
-        # Display completion
-        self._display_completion(result, execution_time, success)
-
-        # Reset current tool
-        self.current_tool = None
-        self.current_progress = 0.0
-        self.execution_start = None
+        self._total_time += execution_time
+        self._total_count += 1
+        if success:
+            self._success_count += 1
+
+        with self._emit_lock:
+            # Drop any pending show/update so neither can land after completion
+            for timer in (self._show_timer, self._flush_timer):
+                if timer is not None:
+                    timer.cancel()
+            self._show_timer = None
+            self._flush_timer = None
+            self._pending_update = None
+
+            # Display completion; a tool that finished before its panel was
+            # shown is only recorded in the history
+            if self._pending_display is not None:
+                self._pending_display = None
+            elif self._status_widgets:
+                self._complete_progress_widgets(result, execution_time, success)
+            else:
+                self._display_completion(result, execution_time, success)
+
+            # Reset current tool
+            self._schedule_update = _noop
+            self._emit_update = _noop
+            self.current_tool = None
+            self.current_progress = 0.0
+            self.execution_start = None
 
     def request_interrupt(self):
         """Request interruption of current tool execution"""
@@ -97,113 +410,147 @@ class ToolExecutionProgressTracker:
         """Check if interruption has been requested"""
         return self._interrupt_requested
 
-    def _display_initial_progress(self, tool_name: str, params: Dict[str, Any]):
-        """Display initial progress indicator"""
-        if not JUPYTER_AVAILABLE:
-            return
-
-        # Create parameter string
+    def _format_params(self, params: Dict[str, Any]) -> str:
+        """Build the one-line parameter summary shown under the header"""
         param_str = ", ".join([f"{k}={v}" for k, v in params.items() if v is not None])
         if len(param_str) > 80:
             param_str = param_str[:77] + "..."
+        return html.escape(param_str, quote=True)
+
+    def _create_progress_widgets(self, widgets: Any, tool_name: str, params: Dict[str, Any]):
+        """Display the progress panel as widgets that later updates mutate in place"""
+        param_str = self._format_params(params)
+
+        header = widgets.HTML(value=(
+            '<div style="background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); '
+            'color: white; padding: 8px 12px; border-radius: 6px 6px 0 0; '
+            f'font-weight: bold; font-size: 14px;">🛠️ Executing {tool_name}</div>'
+        ))
+        params_label = widgets.HTML(value=(
+            f'<div style="color: #6c757d; font-size: 12px;">{param_str}</div>' if param_str else ''
+        ))
+        bar = widgets.FloatProgress(
+            value=0,
+            min=0,
+            max=100.0,
+            bar_style='info',
+            layout=widgets.Layout(width='100%')
+        )
+        status = widgets.Label(value="Starting execution...")
+        panel = widgets.VBox(
+            [header, params_label, bar, status],
+            layout=widgets.Layout(border='1px solid #e1e4e8', margin='10px 0')
+        )
+
+        self._status_widgets = {
+            "panel": panel,
+            "header": header,
+            "params": params_label,
+            "bar": bar,
+            "status": status,
+        }
+        display(panel)
+
+    def _update_progress_widgets(self, status: Optional[str] = None):
+        """Push the current progress to the widgets; only changed traits are synced"""
+        elapsed_time = time.time() - self.execution_start if self.execution_start else 0
+        self._status_widgets["bar"].value = self.current_progress
+        self._status_widgets["status"].value = status or f"Executing... ({elapsed_time:.1f}s)"
 
-        # Create HTML for initial display
-        html_content = f"""
-        <div id="{self._display_id}" style="
-            border: 1px solid #e1e4e8;
-            border-radius: 6px;
-            margin: 10px 0;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
+    def _complete_progress_widgets(self, result: str, execution_time: float, success: bool):
+        """Switch the widget panel to its completed state"""
+        status_icon = "✅" if success else "❌"
+        status_text = "Completed" if success else "Failed"
+        result_preview = result[:100] + "..." if len(result) > 100 else result
+        result_preview = html.escape(result_preview, quote=True)
+
+        self._status_widgets["header"].value = f"""
+        <div style="
+            background: {'#d4edda' if success else '#f5c6cb'};
+            color: {'#155724' if success else '#721c24'};
+            padding: 8px 12px;
+            border-radius: 6px 6px 0 0;
+            font-weight: bold;
+            font-size: 14px;
+            display: flex;
+            justify-content: space-between;
         ">
-            <div style="
-                background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 8px 12px;
-                border-radius: 6px 6px 0 0;
-                font-weight: bold;
-                font-size: 14px;
-                display: flex;
-                align-items: center;
-                justify-content: space-between;
-            ">
-                <span>🛠️ Executing {tool_name}</span>
-                <button onclick="
-                    // Signal interruption (would need backend integration)
-                    this.innerHTML = '⏸️ Interrupted';
-                    this.disabled = true;
-                " style="
-                    background: rgba(255,255,255,0.2);
-                    border: 1px solid rgba(255,255,255,0.3);
-                    color: white;
-                    padding: 2px 8px;
-                    border-radius: 3px;
-                    cursor: pointer;
-                    font-size: 11px;
-                ">❌ Cancel</button>
-            </div>
-            <div style="padding: 12px; background: #f8f9fa;">
-                {f'<div style="color: #6c757d; font-size: 12px; margin-bottom: 8px;">{param_str}</div>' if param_str else ''}
-                <div style="
-                    background: #e9ecef;
-                    border-radius: 10px;
-                    height: 6px;
-                    overflow: hidden;
-                    margin: 8px 0;
-                ">
-                    <div style="
-                        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-                        height: 100%;
-                        width: 0%;
-                        transition: width 0.3s ease;
-                        animation: pulse 2s ease-in-out infinite;
-                    " id="{self._display_id}_bar"></div>
-                </div>
-                <div id="{self._display_id}_status" style="
-                    color: #495057;
-                    font-size: 12px;
-                    text-align: center;
-                ">Starting execution...</div>
-            </div>
+            <span>{status_icon} {self.current_tool} {status_text}</span>
+            <span style="font-weight: normal; font-size: 12px;">{execution_time:.2f}s</span>
         </div>
-
-        <style>
-        @keyframes pulse {{
-            0%, 100% {{ opacity: 0.6; }}
-            50% {{ opacity: 1; }}
-        }}
-        </style>
         """
+        self._status_widgets["params"].value = (
+            f'<div style="color: #6c757d; font-size: 12px;">{result_preview}</div>'
+        )
+        bar = self._status_widgets["bar"]
+        bar.value = 100.0 if success else self.current_progress
+        bar.bar_style = 'success' if success else 'danger'
+        self._status_widgets["status"].layout.display = 'none'
+
+        # The full result is escaped and rendered only when first expanded.
+        # The handler must not reference self: the front end keeps the widget
+        # (and so the handler) alive long after this execution has finished.
+        widgets = _load_widgets()
+        output = widgets.Output()
+        accordion = widgets.Accordion(children=[output])
+        accordion.set_title(0, "📋 Full Result")
+        accordion.selected_index = None
+
+        def on_expand(change):
+            nonlocal result
+            if change["new"] is None or result is None:
+                return
+            with output:
+                display(HTML(
+                    '<div style="max-height: 300px; overflow-y: auto; '
+                    "font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace; "
+                    f'font-size: 12px; white-space: pre-wrap;">{_escape_text(result)}</div>'
+                ))
+            result = None
+
+        accordion.observe(on_expand, names="selected_index")
+        panel = self._status_widgets["panel"]
+        panel.children = tuple(panel.children) + (accordion,)
+        self._status_widgets = {}
+
+    def _display_initial_progress(self, tool_name: str, params: Dict[str, Any]):
+        """Display initial progress indicator"""
+        if not JUPYTER_AVAILABLE:
+            return
 
-        display(HTML(html_content), display_id=self._display_id)
+        # Only progress and status change after the panel is first shown
+        param_str = self._format_params(params)
+        self._panel_fields = {
+            "did": self._display_id,
+            "tool_name": tool_name,
+            "param_block": _PARAM_BLOCK_TEMPLATE.substitute(param_str=param_str) if param_str else "",
+        }
+
+        _inject_styles()
+        self._last_rendered = (self.current_progress, "Starting execution...")
+        display(HTML(self._render_panel("Starting execution...")), display_id=self._display_id)
+
+    def _render_panel(self, status_text: str) -> str:
+        """Fill the panel template with the current progress and status"""
+        return _INITIAL_TEMPLATE.substitute(
+            self._panel_fields,
+            progress=self.current_progress,
+            status=self._escape_html(status_text)
+        )
 
     def _update_progress_display(self, status: str = None):
         """Update the progress display"""
-        if not JUPYTER_AVAILABLE or not self._display_id:
-            return
-
         elapsed_time = time.time() - self.execution_start if self.execution_start else 0
         status_text = status or f"Executing... ({elapsed_time:.1f}s)"
 
-        # Update progress bar and status
-        js_update = f"""
-        <script>
-        (function() {{
-            var bar = document.getElementById('{self._display_id}_bar');
-            var status = document.getElementById('{self._display_id}_status');
-
-            if (bar) {{
-                bar.style.width = '{self.current_progress}%';
-            }}
-
-            if (status) {{
-                status.innerHTML = '{status_text}';
-            }}
-        }})();
-        </script>
-        """
+        # Repeated reports of the same progress and status need no redraw
+        rendered = (self.current_progress, status_text)
+        if rendered == self._last_rendered:
+            return
+        self._last_rendered = rendered
 
         try:
-            update_display(HTML(js_update), display_id=f"{self._display_id}_update")
+            update_display(HTML(self._render_panel(status_text)), display_id=self._display_id)
         except:
             pass  # Ignore update failures
 
@@ -215,68 +562,22 @@ class ToolExecutionProgressTracker:
         status_icon = "✅" if success else "❌"
         status_text = "Completed" if success else "Failed"
         result_preview = result[:100] + "..." if len(result) > 100 else result
+        result_preview = html.escape(result_preview, quote=True)
 
         # Create expandable result section
-        result_id = f"{self._display_id}_result"
-        html_completion = f"""
-        <div id="{self._display_id}" style="
-            border: 1px solid #{'d4edda' if success else 'f5c6cb'};
-            border-radius: 6px;
-            margin: 10px 0;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-        ">
-            <div style="
-                background: {'#d4edda' if success else '#f5c6cb'};
-                color: {'#155724' if success else '#721c24'};
-                padding: 8px 12px;
-                border-radius: 6px 6px 0 0;
-                font-weight: bold;
-                font-size: 14px;
-                display: flex;
-                align-items: center;
-                justify-content: space-between;
-            ">
-                <span>{status_icon} {self.current_tool} {status_text}</span>
-                <span style="font-weight: normal; font-size: 12px;">{execution_time:.2f}s</span>
-            </div>
-            <div style="padding: 12px; background: #f8f9fa;">
-                <div style="
-                    color: #6c757d;
-                    font-size: 12px;
-                    margin-bottom: 8px;
-                ">{result_preview}</div>
-                <div style="text-align: center;">
-                    <button onclick="
-                        var resultDiv = document.getElementById('{result_id}');
-                        var isHidden = resultDiv.style.display === 'none';
-                        resultDiv.style.display = isHidden ? 'block' : 'none';
-                        this.innerHTML = isHidden ? '📋 Hide Full Result' : '📋 Show Full Result';
-                    " style="
-                        background: #007bff;
-                        color: white;
-                        border: none;
-                        padding: 6px 12px;
-                        border-radius: 4px;
-                        cursor: pointer;
-                        font-size: 12px;
-                    ">📋 Show Full Result</button>
-                </div>
-                <div id="{result_id}" style="
-                    display: none;
-                    background: white;
-                    border: 1px solid #e9ecef;
-                    border-radius: 4px;
-                    padding: 12px;
-                    margin-top: 8px;
-                    max-height: 300px;
-                    overflow-y: auto;
-                    font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
-                    font-size: 12px;
-                    white-space: pre-wrap;
-                ">{self._escape_html(result)}</div>
-            </div>
-        </div>
-        """
+        html_completion = _COMPLETION_TEMPLATE.substitute(
+            did=self._display_id,
+            border='#d4edda' if success else '#f5c6cb',
+            background='#d4edda' if success else '#f5c6cb',
+            color='#155724' if success else '#721c24',
+            status_icon=status_icon,
+            tool_name=self.current_tool,
+            status_text=status_text,
+            execution_time=f"{execution_time:.2f}",
+            result_preview=result_preview,
+            result_id=f"{self._display_id}_result",
+            result_html=self._escape_html(result)
+        )
 
         try:
             update_display(HTML(html_completion), display_id=self._display_id)
@@ -286,11 +587,7 @@ class ToolExecutionProgressTracker:
 
     def _escape_html(self, text: str) -> str:
         """Escape HTML special characters"""
-        return (text.replace("&", "&amp;")
-                   .replace("<", "&lt;")
-                   .replace(">", "&gt;")
-                   .replace('"', "&quot;")
-                   .replace("'", "&#x27;"))
+        return _escape_text(text)
 
 
 class LiveExecutionDisplay:
@@ -303,13 +600,13 @@ class LiveExecutionDisplay:
     @contextmanager
     def tool_execution(self, tool_name: str, params: Dict[str, Any] = None):
         """Context manager for tool execution with progress tracking"""
-        self.tracker.start_tool_execution(tool_name, params or {})
+        self.tracker.start_tool_execution(tool_name, params)
         success = False
-        result = ""
+        # Kept for exits that none of the clauses below handle (e.g. GeneratorExit)
+        result = "Execution completed"
 
         try:
             yield self.tracker
-            success = True
         except KeyboardInterrupt:
             result = "Execution interrupted by user"
             raise
@@ -317,10 +614,9 @@ class LiveExecutionDisplay:
             result = f"Execution failed: {str(e)}"
             raise
         else:
+            success = True
             result = "Execution completed successfully"
         finally:
-            if not result:
-                result = "Execution completed"
             self.tracker.complete_tool_execution(result, success)
 
     def display_execution_summary(self):
@@ -329,25 +625,27 @@ class LiveExecutionDisplay:
             display(HTML('<div style="color: #6c757d; text-align: center;">No tool executions recorded</div>'))
             return
 
-        total_time = sum(tool["execution_time"] for tool in self.tracker.tool_history)
-        successful_count = sum(1 for tool in self.tracker.tool_history if tool["success"])
-        total_count = len(self.tracker.tool_history)
+        total_time = self.tracker._total_time
+        successful_count = self.tracker._success_count
+        total_count = self.tracker._total_count
 
         # Create summary table
-        rows = ""
-        for tool in self.tracker.tool_history[-10:]:  # Show last 10 executions
+        # Show last 10 executions
+        recent_tools = list(itertools.islice(reversed(self.tracker.tool_history), 10))[::-1]
+        row_parts: List[str] = []
+        for tool in recent_tools:
             status_icon = "✅" if tool["success"] else "❌"
-            timestamp = tool["timestamp"][:19]  # Remove microseconds
             time_str = f"{tool['execution_time']:.2f}s"
 
-            rows += f"""
+            row_parts.append(f"""
             <tr>
                 <td style="text-align: center;">{status_icon}</td>
                 <td>{tool['name']}</td>
                 <td style="text-align: right;">{time_str}</td>
-                <td style="font-size: 11px; color: #6c757d;">{timestamp}</td>
+                <td style="font-size: 11px; color: #6c757d;">{tool['timestamp']}</td>
             </tr>
-            """
+            """)
+        rows = "".join(row_parts)
 
         html_summary = f"""
         <div style="
@@ -404,8 +702,12 @@ def display_execution_summary():
 
 def create_interactive_execution_widget() -> Optional[Any]:
     """Create an interactive widget for controlling tool execution"""
-    if not JUPYTER_AVAILABLE or not widgets:
+    if not JUPYTER_AVAILABLE or not WIDGETS_AVAILABLE:
         return None
+    try:
+        widgets = _load_widgets()
+    except ImportError:
+        return None  # Installed but broken ipywidgets
 
     # Create widget components
     output = widgets.Output()
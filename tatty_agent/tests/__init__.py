@@ -15,9 +15,6 @@ test_basic_functionality()
 ```
 """
 
-import tempfile
-import traceback
-from pathlib import Path
 from typing import Dict, Any
 
 def test_basic_imports() -> Dict[str, Any]:
@@ -44,6 +41,8 @@ def test_agent_creation() -> Dict[str, Any]:
     result = {"test": "agent_creation", "passed": False, "error": None}
 
     try:
+        import tempfile
+
         from tatty_agent import TattyAgent
 
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -92,6 +91,8 @@ def test_project_initialization() -> Dict[str, Any]:
     result = {"test": "project_initialization", "passed": False, "error": None}
 
     try:
+        import tempfile
+
         from tatty_agent.config.initialization import ProjectInitializer
 
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -265,6 +266,7 @@ def test_basic_functionality():
         print("🎉 Basic functionality working!")
 
     except Exception as e:
+        import traceback
         print(f"❌ Basic functionality test failed: {e}")
         traceback.print_exc()
 